@@ -7,11 +7,11 @@ import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from app.services.llm import llm_service
-from app.services.tts_unified import unified_tts_service
+from app.services.llm import LLMService, get_llm_service
+from app.services.tts_unified import UnifiedTTSService, get_unified_tts_service
 from app.services.concept_extractor import init_concept_extractor
 from app.core.logging_config import get_logger
 
@@ -30,7 +30,7 @@ AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 concept_extractor = None
 
 
-def get_concept_extractor():
+def get_concept_extractor(llm_service: LLMService):
     """Get or initialize concept extractor."""
     global concept_extractor
     if concept_extractor is None:
@@ -189,7 +189,11 @@ def _generate_chapters_from_sections(
 
 
 @router.post("/generate", response_model=GenerateResponse)
-async def generate_episode(request: GenerateRequest):
+async def generate_episode(
+    request: GenerateRequest,
+    llm_service: LLMService = Depends(get_llm_service),
+    unified_tts_service: UnifiedTTSService = Depends(get_unified_tts_service),
+):
     """
     Generate a complete 2-3 minute interactive learning episode with concepts.
 
@@ -226,12 +230,15 @@ async def generate_episode(request: GenerateRequest):
     if not topic:
         raise HTTPException(status_code=400, detail="Topic cannot be empty")
 
+    # Episode audio, encoded while dialogue sections are still being written
+    episode_audio = None
+
     try:
         # MVP_0 Step 1: Extract concepts from document (if available)
         document_concepts = []
         if document_text:
             logger.info("extracting_concepts_from_document")
-            extractor = get_concept_extractor()
+            extractor = get_concept_extractor(llm_service)
             document_concepts = await extractor.extract_concepts_from_document(
                 document_text=document_text,
                 target_count=10
@@ -246,21 +253,40 @@ async def generate_episode(request: GenerateRequest):
             duration=1.0,  # Reduced from 3.0 for faster testing
         )
 
+        # Create unique episode ID
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        episode_id = f"ep_{timestamp}"
+        audio_filename = f"{episode_id}.mp3"
+        audio_path = AUDIO_DIR / audio_filename
+
+        episode_audio = await unified_tts_service.start_episode_audio(
+            output_path=str(audio_path),
+            silence_between_turns=400,  # 400ms for faster pace
+            use_emotions=True
+        )
+
         # Step 3: Generate dialogue (now includes concept markers and pause moments)
+        # TTS for each section starts as soon as its dialogue is written, and
+        # turns are encoded as soon as every turn before them is ready, so
+        # audio overlaps the remaining LLM calls
         logger.info("generating_dialogue_with_learning_features")
-        dialogue_result = await llm_service.generate_dialogue(
+        section_turns = {}
+        async for index, section_id, turns in llm_service.stream_dialogue_sections(
             outline=outline,
             teaching_materials=document_concepts,  # Pass concepts so LLM incorporates them
             topic=topic,
             level="adaptive",
             duration=1.0,  # Reduced from 3.0 for faster testing
-        )
+        ):
+            section_turns[index] = turns
+            episode_audio.add_section(index, turns)
+            logger.info("section_tts_started", section_id=section_id, turn_count=len(turns))
 
-        script = dialogue_result["script"]
-        metadata = dialogue_result["metadata"]
+        section_order = sorted(section_turns)
+        script = [turn for index in section_order for turn in section_turns[index]]
 
         # MVP_0 Step 4: Extract concepts and pause moments from dialogue
-        extractor = get_concept_extractor()
+        extractor = get_concept_extractor(llm_service)
         dialogue_concept_map = extractor.extract_concepts_from_dialogue(script)
         pause_moments = extractor.extract_pause_moments(script)
 
@@ -296,19 +322,8 @@ async def generate_episode(request: GenerateRequest):
         # Step 6: Generate audio
         logger.info("generating_audio", turn_count=len(script))
 
-        # Create unique episode ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        episode_id = f"ep_{timestamp}"
-        audio_filename = f"{episode_id}.mp3"
-        audio_path = AUDIO_DIR / audio_filename
-
-        # Generate audio using unified TTS service (Parler TTS with parallel processing)
-        audio_result = await unified_tts_service.generate_episode_audio(
-            script=script,
-            output_path=str(audio_path),
-            silence_between_turns=400,  # 400ms for faster pace
-            use_emotions=True
-        )
+        # Finish the audio started in Step 3 (Parler TTS with parallel processing)
+        audio_result = await episode_audio.finish()
 
         # NEW Step 7: Enrich dialogue script with actual timing metadata
         turn_timings = audio_result.get('turn_timings', [])
@@ -360,6 +375,8 @@ async def generate_episode(request: GenerateRequest):
         )
 
     except Exception as e:
+        if episode_audio is not None:
+            episode_audio.abort()
         logger.error("episode_generation_failed", error=str(e))
         raise HTTPException(
             status_code=500,
@@ -11,10 +11,10 @@ Endpoints:
 import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from app.services.llm import llm_service
+from app.services.llm import get_llm_service
 from app.services.quiz_generator import init_quiz_generator
 from app.services.learning_coach import init_learning_coach
 from app.services.struggle_detector import struggle_detector
@@ -37,13 +37,26 @@ from app.models.quiz_session import (
     QuestionStatus
 )
 
-router = APIRouter()
 logger = get_logger(__name__)
 
-# Initialize services
-quiz_generator = init_quiz_generator(llm_service)
-learning_coach = init_learning_coach(llm_service)
-socratic_hint_gen = init_socratic_hint_generator(llm_service)
+# Services are created on the first quiz request (see init_quiz_services)
+quiz_generator = None
+learning_coach = None
+socratic_hint_gen = None
+
+
+async def init_quiz_services():
+    """Initialize the quiz services once the LLM service exists."""
+    global quiz_generator, learning_coach, socratic_hint_gen
+    llm_service = await get_llm_service()
+    # No await between the check and the assignments - safe without a lock
+    if socratic_hint_gen is None:
+        quiz_generator = init_quiz_generator(llm_service)
+        learning_coach = init_learning_coach(llm_service)
+        socratic_hint_gen = init_socratic_hint_generator(llm_service)
+
+
+router = APIRouter(dependencies=[Depends(init_quiz_services)])
 
 
 # Request/Response Models
@@ -174,7 +187,7 @@ async def generate_quiz(request: GenerateQuizRequest):
     try:
         # Extract concepts
         logger.info("extracting_concepts_for_quiz")
-        extractor = init_concept_extractor(llm_service)
+        extractor = init_concept_extractor(await get_llm_service())
         concepts = await extractor.extract_concepts_from_document(
             document_text=document_text,
             target_count=10
@@ -216,6 +229,9 @@ async def generate_quiz(request: GenerateQuizRequest):
             target_question_count=request.question_count
         )
 
+        # Search concepts the live hint path will need while the user starts
+        socratic_hint_gen.prewarm_concept_searches(questions)
+
         # Create quiz session
         quiz_session_id = f"quiz_{uuid.uuid4().hex[:12]}"
         quiz_session = create_quiz_session(
@@ -387,6 +403,14 @@ async def submit_answer(request: SubmitAnswerRequest):
             logger.error("socratic_hint_generation_failed_in_submit", error=str(e))
             # Fall back to legacy hint if Socratic generation fails
 
+        # Prefetch the next hint level so "more help" is instant
+        socratic_hint_gen.prefetch_socratic_hint(
+            question=question,
+            selected_option=request.selected_option,
+            hint_level=hint_level + 1,
+            document_context=quiz_session.document_text
+        )
+
         # Track hint usage
         if hint_level not in q_progress.hints_used:
             q_progress.hints_used.append(hint_level)
@@ -46,9 +46,12 @@ class Settings(BaseSettings):
     # Limits
     max_sources_per_section: int = 5
     max_episode_duration_min: int = 20
+    tts_max_workers: int = 4  # Concurrent turn requests per episode (gTTS / Maya1)
 
     # Storage
     audio_storage_path: str = "./data/audio"
+    tts_cache_codec: str = "opus"  # "wav", "opus" or "flac" - codec for cached TTS audio (mono 16 kHz)
+    tts_cache_max_bytes: int = 500 * 1024 * 1024  # On-disk TTS cache cap (LRU eviction)
 
     class Config:
         env_file = ".env"
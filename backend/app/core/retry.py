@@ -0,0 +1,64 @@
+"""
+Retry policy for provider network calls (LLM APIs, TTS servers).
+
+Transient failures - rate limits (429), server errors (5xx, including HF
+"model loading" 503s) and timeouts - are retried with jittered exponential
+backoff. Anything else (bad request, auth) fails on the first attempt.
+"""
+
+from typing import Callable
+
+import httpx
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Backoff tuning
+RETRY_ATTEMPTS = 5
+RETRY_INITIAL_WAIT = 1  # seconds
+RETRY_MAX_WAIT = 30  # seconds
+
+
+def is_retryable_http_error(exc: BaseException) -> bool:
+    """True for httpx timeouts/connection errors and 429/5xx responses."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError))
+
+
+def _log_retry(retry_state):
+    """Log each backoff before sleeping."""
+    logger.warning(
+        "network_call_retry",
+        call=retry_state.fn.__qualname__,
+        attempt=retry_state.attempt_number,
+        wait_seconds=round(retry_state.next_action.sleep, 2),
+        error=str(retry_state.outcome.exception()),
+    )
+
+
+def network_retry(is_retryable: Callable[[BaseException], bool] = is_retryable_http_error):
+    """
+    Decorator retrying a (sync or async) network call on transient errors.
+
+    Args:
+        is_retryable: Predicate deciding which exceptions are transient
+
+    Returns:
+        tenacity retry decorator
+    """
+    return retry(
+        stop=stop_after_attempt(RETRY_ATTEMPTS),
+        wait=wait_exponential_jitter(initial=RETRY_INITIAL_WAIT, max=RETRY_MAX_WAIT),
+        retry=retry_if_exception(is_retryable),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
@@ -2,6 +2,7 @@
 Main FastAPI application entry point.
 """
 
+import asyncio
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -9,6 +10,9 @@ from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.core.logging_config import setup_logging, get_logger
 from app.api.endpoints import outline, episode, health, generate, upload, quiz
+from app.services.llm import close_llm_service, get_llm_service
+from app.services.maya1_client import close_maya1_http_client
+from app.services.parler_client import close_parler_http_client
 
 # Set up logging
 setup_logging()
@@ -46,10 +50,21 @@ app.include_router(quiz.router, prefix="/api", tags=["quiz"])  # Interactive qui
 app.mount("/", StaticFiles(directory=STATIC_DIR, html=True), name="static")
 
 
+async def _warm_up_llm():
+    """Create the LLM service and pre-open its provider connections."""
+    try:
+        llm_service = await get_llm_service()
+        await llm_service.warm_up()
+    except Exception as e:
+        logger.warning("llm_warm_up_skipped", error=str(e))
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup tasks."""
     logger.info("starting_application", environment=settings.app_env)
+    # Build the LLM service and open provider connections in the background
+    app.state.llm_warm_up = asyncio.create_task(_warm_up_llm())
     # TODO: Initialize database connection
     # TODO: Initialize Redis connection
     # TODO: Initialize Qdrant connection
@@ -59,6 +74,9 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown tasks."""
     logger.info("shutting_down_application")
+    await close_llm_service()
+    await close_parler_http_client()
+    await close_maya1_http_client()
     # TODO: Close database connections
     # TODO: Close Redis connection
 
@@ -2,8 +2,9 @@
 Pydantic schemas for request/response models.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Type
 from enum import Enum
 
 
@@ -110,3 +111,126 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     environment: str
+
+
+# LLM output schemas - validated straight from the raw JSON response
+# (extra fields the LLM adds are kept and passed through)
+
+class LLMOutlineSection(BaseModel):
+    """A section of a generated outline."""
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    title: str
+    description: str = ""
+    learning_outcomes: List[str] = []
+    is_socratic_checkpoint: bool = False
+    estimated_duration_sec: int = 0
+
+
+class LLMOutline(BaseModel):
+    """Outline as returned by LLMService.generate_outline."""
+    model_config = ConfigDict(extra="allow")
+
+    title: str
+    socratic_question: str = ""
+    key_insight: str = ""
+    description: str = ""
+    sections: List[LLMOutlineSection] = Field(..., min_length=1)
+    estimated_duration_min: float
+    estimated_word_count: int = 0
+
+
+class LLMDialogueTurn(BaseModel):
+    """A single generated dialogue turn."""
+    model_config = ConfigDict(extra="allow")
+
+    speaker: Speaker
+    text: str
+    section_id: Optional[str] = None
+    notes: str = ""
+
+
+class LLMDialogueSection(BaseModel):
+    """Generated dialogue for one outline section."""
+    script: List[LLMDialogueTurn]
+
+
+class LLMQuizOption(BaseModel):
+    """A multiple-choice option."""
+    id: str
+    text: str
+
+
+class LLMQuizHint(BaseModel):
+    """A graduated quiz hint."""
+    level: int
+    type: str = ""
+    text: str
+
+
+class LLMDistractorHints(BaseModel):
+    """Socratic hints for one wrong option, generated with the question."""
+    option_id: str
+    wrong_answer_reasoning: str
+    level_1: List[str]
+    level_2: List[str]
+    level_3: List[str]
+    guiding_questions: List[str] = []
+
+
+class LLMQuizQuestion(BaseModel):
+    """One quiz question as returned by QuizGenerator._generate_question."""
+    model_config = ConfigDict(extra="allow")
+
+    question: str
+    options: List[LLMQuizOption] = Field(..., min_length=2)
+    correct_answer: str
+    explanation: str
+    hints: List[LLMQuizHint]
+    difficulty: str = "medium"
+    distractor_hints: List[LLMDistractorHints] = []
+
+
+class LLMSocraticHint(BaseModel):
+    """Socratic hint as returned by SocraticHintGenerator._generate_hint_with_llm."""
+    model_config = ConfigDict(extra="allow")
+
+    wrong_answer_reasoning: str
+    socratic_questions: List[str]
+    guiding_questions: List[str]
+    search_context_summary: str = ""
+
+
+# Schema fields Gemini's response_schema (OpenAPI subset) accepts
+GEMINI_SCHEMA_KEYS = {"type", "description", "nullable", "enum", "properties", "required", "items"}
+
+
+def _to_gemini_schema(schema: dict, defs: dict) -> dict:
+    """Inline $refs, collapse Optional anyOf to nullable, drop unsupported keys."""
+    if "$ref" in schema:
+        return _to_gemini_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        result = _to_gemini_schema(options[0], defs)
+        if len(options) < len(schema["anyOf"]):
+            result["nullable"] = True
+        return result
+
+    result = {}
+    for key, value in schema.items():
+        if key == "properties":
+            result[key] = {name: _to_gemini_schema(prop, defs) for name, prop in value.items()}
+        elif key == "items":
+            result[key] = _to_gemini_schema(value, defs)
+        elif key in GEMINI_SCHEMA_KEYS:
+            result[key] = value
+    return result
+
+
+@lru_cache(maxsize=None)
+def gemini_response_schema(model: Type[BaseModel]) -> dict:
+    """Gemini response_schema dict for a pydantic model (built once per model)."""
+    schema = model.model_json_schema()
+    return _to_gemini_schema(schema, schema.get("$defs", {}))
@@ -84,13 +84,16 @@ EMOTION_TAGS = {
 }
 
 
+# Speaker name -> voice profile
+VOICE_PROFILES = {
+    "Brainy": BRAINY_PROFILE,
+    "Snarky": SNARKY_PROFILE,
+}
+
+
 def get_voice_profile(speaker: str) -> VoiceProfile:
     """Get voice profile for a speaker."""
-    profiles = {
-        "Brainy": BRAINY_PROFILE,
-        "Snarky": SNARKY_PROFILE,
-    }
-    return profiles.get(speaker, BRAINY_PROFILE)
+    return VOICE_PROFILES.get(speaker, BRAINY_PROFILE)
 
 
 def add_emotion_tags(text: str, speaker: str, context: str = None) -> str:
@@ -107,23 +110,24 @@ def add_emotion_tags(text: str, speaker: str, context: str = None) -> str:
     """
     # Simple rule-based emotion insertion
     # In production, this could be ML-driven or LLM-enhanced
+    lowered = text.lower()
 
     if speaker == "Brainy":
         # Brainy is thoughtful and measured
-        if "exactly" in text.lower() or "that's right" in text.lower():
+        if "exactly" in lowered or "that's right" in lowered:
             return f"<encouraging> {text}"
-        elif "hmm" in text.lower() or "interesting" in text.lower():
+        elif "hmm" in lowered or "interesting" in lowered:
             return f"<thoughtful> {text}"
         elif "!" in text and len(text.split()) < 10:  # Short exclamation
             return f"<chuckle> {text}"
 
     else:  # Snarky
         # Snarky is energetic and expressive
-        if "wait" in text.lower() or "hold" in text.lower():
+        if "wait" in lowered or "hold" in lowered:
             return f"<confused> {text}"
-        elif "oh!" in text.lower() or "aha!" in text.lower():
+        elif "oh!" in lowered or "aha!" in lowered:
             return f"<gasp> {text}"
-        elif "haha" in text.lower() or text.count("!") > 1:
+        elif "haha" in lowered or text.count("!") > 1:
             return f"<laugh> {text}"
         elif "..." in text:
             return f"<whisper> {text}"
@@ -0,0 +1,392 @@
+"""
+Audio decoding helpers built on a single ffmpeg pipe.
+
+pydub's from_mp3/from_file spawns ffprobe to inspect the input and then
+ffmpeg to decode it. TTS output has a known layout (mono speech), so we
+decode straight to raw PCM and wrap the samples in an AudioSegment
+without probing. With PyAV installed, compressed turns (gTTS MP3, cached
+Opus/FLAC) are decoded in-process through libav instead of forking
+ffmpeg; otherwise one ffmpeg process per decode is used.
+
+Finished episodes are encoded the same way in reverse: raw PCM is piped
+into one ffmpeg process instead of through pydub's temp WAV file, either
+all at once (export_mp3) or turn by turn as turns are synthesized
+(Mp3StreamEncoder).
+
+Also encodes/decodes cached TTS audio in the configured cache codec.
+"""
+
+import asyncio
+import os
+import subprocess
+import tempfile
+from io import BytesIO
+from typing import Union, Tuple
+
+from pydub import AudioSegment
+
+from app.core.config import settings
+from app.services.audio_stitch import conform_segment
+
+# PyAV: in-process libav bindings (optional - falls back to ffmpeg subprocesses)
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# Decoded PCM layout (matches gTTS / Kokoro / Higgs native output)
+DECODE_SAMPLE_RATE = 24000
+DECODE_CHANNELS = 1
+DECODE_SAMPLE_WIDTH = 2  # 16-bit
+
+# Sample width (bytes) -> ffmpeg raw PCM format (pydub's sample layout)
+PCM_FORMATS = {
+    1: "u8",
+    2: "s16le",
+    3: "s24le",
+    4: "s32le",
+}
+
+# Episode MP3 bitrate
+EXPORT_MP3_BITRATE = "128k"
+
+# Streamed episodes are encoded at Parler's native rate (cached 16 kHz
+# turns are upsampled), mono 16-bit
+STREAM_SAMPLE_RATE = 44100
+
+# File extension -> pydub input format for provider output files
+AUDIO_FILE_FORMATS = {
+    "wav": "wav",
+    "mp3": "mp3",
+    "ogg": "ogg",
+    "flac": "flac",
+}
+
+# Cache codec -> (file extension, pydub export kwargs)
+# 24 kbps wideband Opus is indistinguishable for mono speech at ~1/60th the
+# size of 44.1 kHz PCM
+CACHE_CODECS = {
+    "wav": ("wav", {"format": "wav"}),
+    "opus": ("opus", {"format": "ogg", "codec": "libopus", "bitrate": "24k", "parameters": ["-vbr", "on"]}),
+    "flac": ("flac", {"format": "flac"}),
+}
+
+# Cached speech is stored as mono at this rate (Opus wideband)
+CACHE_SAMPLE_RATE = 16000
+
+# File extension -> pydub input format for cached entries
+CACHE_EXTENSION_FORMATS = {
+    "wav": "wav",
+    "opus": "ogg",
+    "flac": "flac",
+}
+
+# Channel count -> PyAV channel layout
+AV_LAYOUTS = {
+    1: "mono",
+    2: "stereo",
+}
+
+
+def _decode_with_av(
+    source: Union[bytes, str],
+    container_format: str,
+    sample_rate: int,
+    channels: int,
+) -> AudioSegment:
+    """
+    Decode compressed audio in-process with PyAV.
+
+    Args:
+        source: Encoded bytes, or a path to an audio file
+        container_format: libav demuxer name ("mp3", "ogg", "flac")
+        sample_rate: Output sample rate
+        channels: Output channel count
+
+    Returns:
+        AudioSegment with 16-bit PCM in the requested layout
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+
+    resampler = av.AudioResampler(format="s16", layout=AV_LAYOUTS[channels], rate=sample_rate)
+    frame_bytes = channels * DECODE_SAMPLE_WIDTH
+    chunks = []
+
+    with av.open(source, format=container_format) as container:
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                # Packed planes can be padded past the last sample
+                chunks.append(memoryview(out.planes[0])[:out.samples * frame_bytes])
+
+        # Flush samples buffered inside the resampler
+        for out in resampler.resample(None):
+            chunks.append(memoryview(out.planes[0])[:out.samples * frame_bytes])
+
+    return AudioSegment(
+        data=b"".join(chunks),
+        sample_width=DECODE_SAMPLE_WIDTH,
+        frame_rate=sample_rate,
+        channels=channels,
+    )
+
+
+def decode_mp3(source: Union[bytes, str]) -> AudioSegment:
+    """
+    Decode MP3 audio to an AudioSegment with a single ffmpeg call.
+
+    Args:
+        source: Raw MP3 bytes, or a path to an MP3 file
+
+    Returns:
+        AudioSegment with 16-bit mono PCM at DECODE_SAMPLE_RATE
+    """
+    if AV_AVAILABLE:
+        return _decode_with_av(source, "mp3", DECODE_SAMPLE_RATE, DECODE_CHANNELS)
+
+    from_bytes = isinstance(source, (bytes, bytearray))
+
+    command = [
+        AudioSegment.converter,
+        "-loglevel", "error",
+        "-f", "mp3",
+        "-i", "pipe:0" if from_bytes else source,
+        "-f", "s16le",
+        "-ar", str(DECODE_SAMPLE_RATE),
+        "-ac", str(DECODE_CHANNELS),
+        "pipe:1",
+    ]
+
+    process = subprocess.run(
+        command,
+        input=source if from_bytes else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    if process.returncode != 0:
+        raise Exception(
+            f"ffmpeg mp3 decode failed: {process.stderr.decode(errors='ignore').strip()}"
+        )
+
+    return AudioSegment(
+        data=process.stdout,
+        sample_width=DECODE_SAMPLE_WIDTH,
+        frame_rate=DECODE_SAMPLE_RATE,
+        channels=DECODE_CHANNELS,
+    )
+
+
+def _mp3_encode_command(
+    frame_rate: int,
+    channels: int,
+    sample_width: int,
+    bitrate: str,
+) -> list:
+    """
+    ffmpeg command encoding raw PCM from stdin to MP3 on stdout.
+
+    The caller hands ffmpeg the open output file as stdout, so the byte
+    count is known from the file position without stat()ing the path.
+    """
+    return [
+        AudioSegment.converter,
+        "-loglevel", "error",
+        "-y",
+        "-f", PCM_FORMATS[sample_width],
+        "-ar", str(frame_rate),
+        "-ac", str(channels),
+        "-i", "pipe:0",
+        "-codec:a", "libmp3lame",
+        "-b:a", bitrate,
+        "-f", "mp3",
+        "pipe:1",
+    ]
+
+
+def export_mp3(audio: AudioSegment, output_path: str, bitrate: str = EXPORT_MP3_BITRATE) -> int:
+    """
+    Encode audio to an MP3 file by piping its raw samples into ffmpeg.
+
+    Args:
+        audio: Audio to encode
+        output_path: Destination MP3 path (overwritten)
+        bitrate: MP3 bitrate
+
+    Returns:
+        Size of the MP3 file in bytes
+    """
+    command = _mp3_encode_command(audio.frame_rate, audio.channels, audio.sample_width, bitrate)
+
+    with open(output_path, "wb") as output:
+        # run() feeds stdin via communicate(), so a full stderr pipe can't deadlock it
+        process = subprocess.run(
+            command,
+            input=audio.raw_data,
+            stdout=output,
+            stderr=subprocess.PIPE,
+        )
+        file_size = output.tell()
+
+    if process.returncode != 0:
+        raise Exception(
+            f"ffmpeg mp3 encode failed: {process.stderr.decode(errors='ignore').strip()}"
+        )
+
+    return file_size
+
+
+class Mp3StreamEncoder:
+    """
+    Incremental MP3 encoder for an episode whose turns arrive over time.
+
+    Turns are written to one ffmpeg process as they become available, so
+    encoding overlaps synthesis instead of starting after the last turn.
+    The output format must be fixed before the first turn is known, so
+    every turn is converted to STREAM_SAMPLE_RATE mono 16-bit PCM.
+
+    Pipe writes block, so they run in a worker thread; ffmpeg's stderr goes
+    to a temporary file rather than a pipe nobody drains while writing.
+    """
+
+    def __init__(self, output_path: str, bitrate: str = EXPORT_MP3_BITRATE):
+        self.output_path = output_path
+        self.frame_rate = STREAM_SAMPLE_RATE
+        self.channels = 1
+        self.sample_width = DECODE_SAMPLE_WIDTH
+        # Frames written so far (the stream position, exact to the output)
+        self.frames_written = 0
+
+        self._output = open(output_path, "wb")
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(
+            _mp3_encode_command(self.frame_rate, self.channels, self.sample_width, bitrate),
+            stdin=subprocess.PIPE,
+            stdout=self._output,
+            stderr=self._stderr,
+        )
+
+    def _write_blocking(self, audio: AudioSegment):
+        """Convert one turn to the stream format and pipe it to ffmpeg."""
+        audio = conform_segment(audio, self.frame_rate, self.channels, self.sample_width)
+        self._process.stdin.write(audio.raw_data)
+        self.frames_written += len(audio.raw_data) // (self.channels * self.sample_width)
+
+    @property
+    def position_ms(self) -> int:
+        """Duration written so far (ms)."""
+        return round(self.frames_written * 1000 / self.frame_rate)
+
+    async def write(self, audio: AudioSegment):
+        """Append audio to the stream."""
+        await asyncio.to_thread(self._write_blocking, audio)
+
+    async def write_silence(self, duration_ms: int):
+        """Append silence to the stream."""
+        frame_count = int(self.frame_rate * duration_ms / 1000)
+        silence = b"\x00" * (frame_count * self.channels * self.sample_width)
+        await asyncio.to_thread(self._process.stdin.write, silence)
+        self.frames_written += frame_count
+
+    def _close_blocking(self) -> int:
+        """Close stdin and wait for ffmpeg to flush the file."""
+        self._process.stdin.close()
+        returncode = self._process.wait()
+
+        file_size = self._output.tell()
+        self._output.close()
+
+        self._stderr.seek(0)
+        stderr = self._stderr.read().decode(errors="ignore").strip()
+        self._stderr.close()
+
+        if returncode != 0:
+            raise Exception(f"ffmpeg mp3 encode failed: {stderr}")
+
+        return file_size
+
+    async def close(self) -> int:
+        """
+        Finish encoding and wait for the MP3 file to be complete.
+
+        Returns:
+            Size of the MP3 file in bytes
+        """
+        return await asyncio.to_thread(self._close_blocking)
+
+    def abort(self):
+        """Stop encoding and remove the partial file."""
+        self._process.kill()
+        self._process.wait()
+        self._output.close()
+        self._stderr.close()
+        try:
+            os.remove(self.output_path)
+        except FileNotFoundError:
+            pass
+
+
+def load_audio_file(audio_path: str) -> AudioSegment:
+    """
+    Load a TTS provider's output file with an explicit input format.
+
+    The format comes from the file extension once: WAV is parsed natively,
+    MP3 goes through decode_mp3, other known formats skip pydub's format
+    sniffing. Unknown extensions fall back to pydub's own detection.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        AudioSegment with the file's audio
+    """
+    extension = os.path.splitext(audio_path)[1].lower().lstrip(".")
+    audio_format = AUDIO_FILE_FORMATS.get(extension)
+
+    if audio_format == "mp3":
+        return decode_mp3(audio_path)
+    return AudioSegment.from_file(audio_path, format=audio_format)
+
+
+def encode_cache_entry(audio: AudioSegment, codec: str = None) -> Tuple[bytes, str]:
+    """
+    Encode audio for the TTS cache, downmixed to mono at CACHE_SAMPLE_RATE.
+
+    Args:
+        audio: Audio to store
+        codec: "wav", "opus" or "flac" (default: settings.tts_cache_codec)
+
+    Returns:
+        Tuple of (encoded bytes, file extension)
+    """
+    codec = codec or settings.tts_cache_codec
+    if codec not in CACHE_CODECS:
+        raise ValueError(f"Unsupported TTS cache codec: {codec}")
+
+    extension, export_kwargs = CACHE_CODECS[codec]
+    audio = audio.set_channels(1).set_frame_rate(CACHE_SAMPLE_RATE)
+
+    buffer = BytesIO()
+    audio.export(buffer, **export_kwargs)
+    return buffer.getvalue(), extension
+
+
+def decode_cache_entry(data: bytes, extension: str) -> AudioSegment:
+    """
+    Decode an encoded TTS cache entry.
+
+    Args:
+        data: Encoded bytes from encode_cache_entry
+        extension: File extension the entry was stored under
+
+    Returns:
+        Decoded AudioSegment
+    """
+    audio_format = CACHE_EXTENSION_FORMATS.get(extension, "wav")
+
+    # WAV is parsed natively by pydub; compressed entries (stored mono at
+    # CACHE_SAMPLE_RATE) decode in-process when PyAV is available
+    if AV_AVAILABLE and audio_format != "wav":
+        return _decode_with_av(data, audio_format, CACHE_SAMPLE_RATE, 1)
+    return AudioSegment.from_file(BytesIO(data), format=audio_format)
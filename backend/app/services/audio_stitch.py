@@ -0,0 +1,86 @@
+"""
+Join dialogue turn audio into one episode track.
+
+pydub's `a + b` copies both buffers into a new AudioSegment, so stitching
+an episode with repeated `+=` recopies everything accumulated so far on
+every turn (quadratic in episode length). Here turns are brought to one
+common format and their raw samples joined in a single pass. Services that
+conform each turn on arrival (conform_segment) make that a no-op.
+"""
+
+from functools import lru_cache
+from typing import List
+
+from pydub import AudioSegment
+
+
+@lru_cache(maxsize=16)
+def _silence_bytes(silence_ms: int, frame_rate: int, channels: int, sample_width: int) -> bytes:
+    """Raw PCM silence for one gap, built once per format and reused across episodes."""
+    return b"\x00" * (int(frame_rate * silence_ms / 1000) * channels * sample_width)
+
+
+def conform_segment(
+    segment: AudioSegment,
+    frame_rate: int,
+    channels: int,
+    sample_width: int,
+) -> AudioSegment:
+    """
+    Convert a segment to the given PCM format (no-op if it already matches).
+
+    Args:
+        segment: Audio to convert
+        frame_rate: Target sample rate
+        channels: Target channel count
+        sample_width: Target bytes per sample
+
+    Returns:
+        The segment in the target format
+    """
+    if segment.channels != channels:
+        segment = segment.set_channels(channels)
+    if segment.frame_rate != frame_rate:
+        segment = segment.set_frame_rate(frame_rate)
+    if segment.sample_width != sample_width:
+        segment = segment.set_sample_width(sample_width)
+    return segment
+
+
+def join_segments(segments: List[AudioSegment], silence_ms: int = 0) -> AudioSegment:
+    """
+    Concatenate segments with silence between them in linear time.
+
+    Segments are converted to the highest frame rate, channel count and
+    sample width among them (the same format pydub's `+` would produce).
+
+    Args:
+        segments: Turn audio in playback order
+        silence_ms: Pause inserted between consecutive segments (ms)
+
+    Returns:
+        The joined AudioSegment
+    """
+    if not segments:
+        return AudioSegment.empty()
+
+    frame_rate = max(s.frame_rate for s in segments)
+    channels = max(s.channels for s in segments)
+    sample_width = max(s.sample_width for s in segments)
+
+    silence = _silence_bytes(silence_ms, frame_rate, channels, sample_width)
+
+    chunks = []
+    for i, segment in enumerate(segments):
+        segment = conform_segment(segment, frame_rate, channels, sample_width)
+
+        if i > 0 and silence:
+            chunks.append(silence)
+        chunks.append(segment.raw_data)
+
+    return AudioSegment(
+        data=b"".join(chunks),
+        sample_width=sample_width,
+        frame_rate=frame_rate,
+        channels=channels,
+    )
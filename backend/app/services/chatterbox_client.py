@@ -11,19 +11,34 @@ Chatterbox features:
 """
 
 import os
-import tempfile
+import time
 import requests
+from io import BytesIO
 from typing import Optional
 from pathlib import Path
 
 from gradio_client import Client
 from pydub import AudioSegment
+from requests.adapters import HTTPAdapter
 
 from app.core.logging_config import get_logger
+from app.services.audio_decoder import load_audio_file
 from app.models.voice_profiles import VoiceProfile
 
 logger = get_logger(__name__)
 
+# Health checks hit the HF Spaces API instead of running a synthesis
+HF_SPACES_API_URL = "https://huggingface.co/api/spaces"
+HEALTH_CHECK_TTL_SECONDS = 60
+
+# Shared keep-alive pool for local API calls: turns are generated from worker
+# threads, and a fresh connection per turn pays a TCP (and TLS) handshake
+HTTP_POOL_SIZE = 8
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
 
 class ChatterboxClient:
     """
@@ -43,6 +58,7 @@ class ChatterboxClient:
         self.space_name = "ResembleAI/Chatterbox"
         self.hf_token = hf_token or os.getenv("HUGGINGFACE_API_KEY", None)
         self.client = None
+        self._last_success_at: Optional[float] = None
 
         if self.use_local:
             logger.info("chatterbox_mode", mode="local", url=self.local_url)
@@ -145,19 +161,11 @@ class ChatterboxClient:
             )
 
             # Longer timeout for CPU inference (can take 2-3 min per request)
-            response = requests.post(url, json=payload, timeout=300)
+            response = _session.post(url, json=payload, timeout=300)
             response.raise_for_status()
 
-            # Save response to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-                tmp_file.write(response.content)
-                tmp_path = tmp_file.name
-
-            # Load audio file
-            audio = AudioSegment.from_wav(tmp_path)
-
-            # Clean up temp file
-            os.unlink(tmp_path)
+            # Decode WAV response in memory
+            audio = AudioSegment.from_file(BytesIO(response.content), format="wav")
 
             logger.info(
                 "chatterbox_generate_success",
@@ -221,14 +229,8 @@ class ChatterboxClient:
 
             logger.info("chatterbox_audio_path_received", path=audio_path)
 
-            # Load audio file
-            if audio_path.endswith('.wav'):
-                audio = AudioSegment.from_wav(audio_path)
-            elif audio_path.endswith('.mp3'):
-                audio = AudioSegment.from_mp3(audio_path)
-            else:
-                # Try as WAV by default
-                audio = AudioSegment.from_file(audio_path)
+            # Load audio file (format derived from extension)
+            audio = load_audio_file(audio_path)
 
             logger.info(
                 "chatterbox_generate_success",
@@ -236,6 +238,7 @@ class ChatterboxClient:
                 provider="gradio_space"
             )
 
+            self._last_success_at = time.monotonic()
             return audio
 
         except Exception as e:
@@ -248,7 +251,7 @@ class ChatterboxClient:
             if self.use_local:
                 # Test local Chatterbox health endpoint
                 health_url = f"{self.local_url}/health"
-                response = requests.get(health_url, timeout=5)
+                response = _session.get(health_url, timeout=5)
                 response.raise_for_status()
                 health_data = response.json()
                 logger.info("local_chatterbox_health_check", status=health_data.get("status"))
@@ -258,18 +261,33 @@ class ChatterboxClient:
                 if self.client is None:
                     self._initialize_client()
 
-                if self.client:
-                    # Test with a simple request (auto-detect endpoint)
-                    result = self.client.predict(
-                        "test",
-                        "neutral voice",
-                        0.5,
-                        0.5
-                    )
-                    logger.info("chatterbox_connection_test_passed")
+                if self.client is None:
+                    return False
+
+                # A recent successful call is proof enough
+                if (
+                    self._last_success_at is not None
+                    and time.monotonic() - self._last_success_at < HEALTH_CHECK_TTL_SECONDS
+                ):
                     return True
 
-                return False
+                # Space metadata only - no synthesis, no GPU time or quota
+                headers = {"Authorization": f"Bearer {self.hf_token}"} if self.hf_token else {}
+                response = _session.get(
+                    f"{HF_SPACES_API_URL}/{self.space_name}",
+                    headers=headers,
+                    timeout=5
+                )
+                response.raise_for_status()
+
+                stage = response.json().get("runtime", {}).get("stage")
+                if stage is not None and stage != "RUNNING":
+                    logger.warning("chatterbox_space_not_running", stage=stage)
+                    return False
+
+                self._last_success_at = time.monotonic()
+                logger.info("chatterbox_connection_test_passed")
+                return True
 
         except Exception as e:
             logger.warning("chatterbox_connection_test_failed", error=str(e), mode="local" if self.use_local else "remote")
@@ -10,18 +10,30 @@ Higgs Audio V2 is SOTA TTS with:
 """
 
 import os
-import tempfile
-from typing import Optional
-from pathlib import Path
-
-from gradio_client import Client
-from pydub import AudioSegment
+import threading
+from typing import Optional, TYPE_CHECKING
 
 from app.core.logging_config import get_logger
-from app.models.voice_profiles import VoiceProfile
+
+# gradio_client and pydub are heavy imports - loaded on first use
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 logger = get_logger(__name__)
 
+# Scene description prompt sent with every generation request
+_SYSTEM_TPL = (
+    "Generate audio following instruction.\n\n"
+    "<|scene_desc_start|>\n{voice_description}{emotion_clause}\n<|scene_desc_end|>"
+)
+
+# Stop sequences in the Space's dataframe input format (serialized as JSON by gradio)
+_STOP_STRINGS = {
+    'headers': ['stops'],
+    'data': [['<|end_of_text|>'], ['<|eot_id|>']],
+    'metadata': None,
+}
+
 
 class HiggsAudioClient:
     """
@@ -39,6 +51,8 @@ class HiggsAudioClient:
     def _initialize_client(self):
         """Initialize Gradio client connection."""
         try:
+            from gradio_client import Client
+
             logger.info("initializing_higgs_client", space=self.space_name)
 
             # Connect to Higgs Audio V2 Space
@@ -61,7 +75,7 @@ class HiggsAudioClient:
         temperature: float = 0.7,
         reference_audio_path: Optional[str] = None,
         reference_text: Optional[str] = None,
-    ) -> AudioSegment:
+    ) -> "AudioSegment":
         """
         Generate audio using Higgs Audio V2 with optional voice cloning.
 
@@ -80,19 +94,23 @@ class HiggsAudioClient:
         if not self.client:
             raise Exception("Higgs client not initialized")
 
+        from app.services.audio_decoder import load_audio_file
+
         # Build system prompt with voice description and emotion
-        system_prompt = f"Generate audio following instruction.\n\n<|scene_desc_start|>\n{voice_description}"
-        if emotion:
-            system_prompt += f" {emotion} emotion."
-        system_prompt += "\n<|scene_desc_end|>"
+        emotion_clause = f" {emotion} emotion." if emotion else ""
+        system_prompt = _SYSTEM_TPL.format(
+            voice_description=voice_description,
+            emotion_clause=emotion_clause
+        )
 
         # Map voice descriptions to presets if possible
         voice_preset = "EMPTY"  # Let model use description
-        if "british" in voice_description.lower() or "warm" in voice_description.lower():
+        desc_lower = voice_description.lower()
+        if "british" in desc_lower or "warm" in desc_lower:
             voice_preset = "chadwick"  # British male
-        elif "female" in voice_description.lower() or "woman" in voice_description.lower():
+        elif "female" in desc_lower or "woman" in desc_lower:
             voice_preset = "mabel"  # Female
-        elif "male" in voice_description.lower() or "man" in voice_description.lower():
+        elif "male" in desc_lower or "man" in desc_lower:
             voice_preset = "en_man"  # Male
 
         logger.info(
@@ -123,7 +141,7 @@ class HiggsAudioClient:
                 top_p=0.95,
                 top_k=50,
                 system_prompt=system_prompt,
-                stop_strings={'headers': ['stops'], 'data': [['<|end_of_text|>'], ['<|eot_id|>']], 'metadata': None},
+                stop_strings=_STOP_STRINGS,
                 ras_win_len=7,
                 ras_win_max_num_repeat=2,
                 api_name="/generate_speech"
@@ -138,14 +156,8 @@ class HiggsAudioClient:
 
             logger.info("higgs_audio_path_received", path=audio_path)
 
-            # Load audio file
-            if audio_path.endswith('.wav'):
-                audio = AudioSegment.from_wav(audio_path)
-            elif audio_path.endswith('.mp3'):
-                audio = AudioSegment.from_mp3(audio_path)
-            else:
-                # Try as WAV by default
-                audio = AudioSegment.from_file(audio_path)
+            # Load audio file (format derived from extension)
+            audio = load_audio_file(audio_path)
 
             logger.info(
                 "higgs_generate_success",
@@ -182,5 +194,15 @@ class HiggsAudioClient:
             return False
 
 
-# Global client instance
-higgs_client = HiggsAudioClient()
+# Global client instance (created on first use - the constructor connects to the Space)
+_higgs_client: Optional[HiggsAudioClient] = None
+_higgs_client_lock = threading.Lock()
+
+
+def get_higgs_client() -> HiggsAudioClient:
+    """Get or initialize the global Higgs client (connects to the Space)."""
+    global _higgs_client
+    with _higgs_client_lock:
+        if _higgs_client is None:
+            _higgs_client = HiggsAudioClient()
+    return _higgs_client
@@ -10,15 +10,14 @@ Kokoro-82M is a lightweight, high-quality TTS with:
 """
 
 import os
-import tempfile
-from typing import Optional
-from pathlib import Path
-
-from gradio_client import Client
-from pydub import AudioSegment
+import threading
+from typing import Optional, TYPE_CHECKING
 
 from app.core.logging_config import get_logger
-from app.models.voice_profiles import VoiceProfile
+
+# gradio_client and pydub are heavy imports - loaded on first use
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 logger = get_logger(__name__)
 
@@ -40,6 +39,8 @@ class KokoroClient:
     def _initialize_client(self):
         """Initialize Gradio client connection."""
         try:
+            from gradio_client import Client
+
             logger.info("initializing_kokoro_client", space=self.space_name)
 
             # Connect to Kokoro TTS Space (FREE, no token required but we provide it anyway)
@@ -60,7 +61,7 @@ class KokoroClient:
         voice_description: str,
         voice_preset: str = "af_heart",
         speed: float = 1.0,
-    ) -> AudioSegment:
+    ) -> "AudioSegment":
         """
         Generate audio using Kokoro-82M TTS.
 
@@ -77,6 +78,9 @@ class KokoroClient:
         if not self.client:
             raise Exception("Kokoro client not initialized")
 
+        from pydub import AudioSegment
+        from app.services.audio_decoder import load_audio_file
+
         # Map voice descriptions to Kokoro presets
         preset = voice_preset
         desc_lower = voice_description.lower()
@@ -121,15 +125,9 @@ class KokoroClient:
 
             logger.info("kokoro_audio_path_received", path=str(audio_path)[:100])
 
-            # Load audio file
+            # Load audio file (format derived from extension)
             if isinstance(audio_path, str):
-                if audio_path.endswith('.wav'):
-                    audio = AudioSegment.from_wav(audio_path)
-                elif audio_path.endswith('.mp3'):
-                    audio = AudioSegment.from_mp3(audio_path)
-                else:
-                    # Try as WAV by default
-                    audio = AudioSegment.from_file(audio_path)
+                audio = load_audio_file(audio_path)
             else:
                 # If it's a file handle, convert to path
                 audio = AudioSegment.from_file(audio_path)
@@ -169,5 +167,15 @@ class KokoroClient:
             return False
 
 
-# Global client instance
-kokoro_client = KokoroClient()
+# Global client instance (created on first use - the constructor connects to the Space)
+_kokoro_client: Optional[KokoroClient] = None
+_kokoro_client_lock = threading.Lock()
+
+
+def get_kokoro_client() -> KokoroClient:
+    """Get or initialize the global Kokoro client (connects to the Space)."""
+    global _kokoro_client
+    with _kokoro_client_lock:
+        if _kokoro_client is None:
+            _kokoro_client = KokoroClient()
+    return _kokoro_client
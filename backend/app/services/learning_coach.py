@@ -7,14 +7,30 @@ Adapted from worklearn's CoachAgent. Helps learners build understanding through:
 - Graduated hints based on struggle patterns
 """
 
-import json
+import re
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
+import orjson
+
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Characters of document text sent to the LLM as checkpoint context
+DOCUMENT_CONTEXT_CHARS = 1500
+
+# Responses that are clearly "I don't know" - no LLM analysis needed
+CONFUSED_RESPONSE_PATTERN = re.compile(r"^(idk|i don'?t know|dunno)$", re.IGNORECASE)
+
+# Markdown code fences the LLM sometimes wraps JSON in
+JSON_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+
+def _strip_fence(text: str) -> str:
+    """Remove markdown code fences around an LLM JSON response."""
+    return JSON_FENCE_PATTERN.sub("", text.strip())
+
 
 class CheckpointStatus(str, Enum):
     """Status of a learning checkpoint."""
@@ -56,18 +72,22 @@ class LearningCoach:
             target_count=target_checkpoint_count
         )
 
-        system_instruction = """You are a Socratic teaching expert.
+        document_context = document_text[:DOCUMENT_CONTEXT_CHARS]
+
+        # Document context goes in the system instruction so every concept from the
+        # same document shares an identical prompt prefix (provider prefix caching)
+        system_instruction = f"""You are a Socratic teaching expert.
 You create progressive learning checkpoints that guide learners to discover understanding themselves.
-Each checkpoint builds on the previous one, moving from basic foundations to deeper insights."""
+Each checkpoint builds on the previous one, moving from basic foundations to deeper insights.
+
+**Document Context**:
+{document_context}..."""
 
         prompt = f"""Generate {target_checkpoint_count} progressive Socratic checkpoints to help a learner understand this concept.
 
 **Concept**: {concept['name']}
 **Definition**: {concept.get('definition', 'See document context')}
 
-**Document Context**:
-{document_text[:1500]}...
-
 Return as JSON array:
 [
   {{
@@ -134,16 +154,13 @@ CRITICAL Requirements:
 - Checkpoint IDs: cp1, cp2, cp3, etc.
 """
 
-        result = await self.llm_service.generate(
+        checkpoints = await self._generate_json(
             prompt=prompt,
             system_instruction=system_instruction,
             temperature=0.7,
-            max_tokens=2048,
-            response_format="json"
+            max_tokens=2048
         )
 
-        checkpoints = json.loads(result)
-
         logger.info(
             "checkpoints_generated",
             concept=concept['name'],
@@ -195,14 +212,32 @@ CRITICAL Requirements:
             hints[-1] if hints else {"level": 3, "text": "Let me explain..."}
         )
 
+        # Skip the LLM round-trip for obviously confused responses
+        if self._is_obviously_confused(user_response):
+            logger.info(
+                "response_analyzed",
+                checkpoint_id=checkpoint['checkpoint_id'],
+                understanding_level="none",
+                should_advance=False,
+                analysis="heuristic"
+            )
+            return {
+                "hint_level": hint_level,
+                "hint_text": hint_obj['text'],
+                "understanding_level": "none",
+                "should_advance": False,
+                "follow_up_question": (checkpoint.get('follow_up_questions') or [None])[0],
+                "reasoning": "Response does not attempt an answer yet"
+            }
+
         # Analyze response quality using LLM
         system_instruction = """You are analyzing a learner's response to a Socratic question.
 Determine if they've grasped the key insight, are partially there, or are still struggling."""
 
-        conversation_context = "\n".join([
+        conversation_context = "\n".join(
             f"Q: {msg['question']}\nA: {msg['answer']}"
             for msg in conversation_history
-        ])
+        )
 
         prompt = f"""Analyze this learner's response to determine understanding level.
 
@@ -231,16 +266,13 @@ Criteria:
 - should_advance: true only if understanding_level is "good" or "mastery"
 """
 
-        analysis_result = await self.llm_service.generate(
+        analysis = await self._generate_json(
             prompt=prompt,
             system_instruction=system_instruction,
             temperature=0.3,  # Lower temp for consistent evaluation
-            max_tokens=512,
-            response_format="json"
+            max_tokens=512
         )
 
-        analysis = json.loads(analysis_result)
-
         logger.info(
             "response_analyzed",
             checkpoint_id=checkpoint['checkpoint_id'],
@@ -257,6 +289,45 @@ Criteria:
             "reasoning": analysis.get('reasoning', '')
         }
 
+    async def _generate_json(
+        self,
+        prompt: str,
+        system_instruction: str,
+        temperature: float,
+        max_tokens: int
+    ) -> Any:
+        """
+        Generate a JSON response and parse it.
+
+        Retries once at a lower temperature if the LLM returns malformed JSON.
+        """
+        for attempt in range(2):
+            result = await self.llm_service.generate(
+                prompt=prompt,
+                system_instruction=system_instruction,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format="json"
+            )
+            text = _strip_fence(result)
+
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError as e:
+                if attempt == 1:
+                    raise
+                logger.warning(
+                    "learning_coach_invalid_json_retrying",
+                    error=str(e),
+                    response_preview=text[:200]
+                )
+                temperature = max(0.0, temperature - 0.2)
+
+    def _is_obviously_confused(self, user_response: str) -> bool:
+        """Check if a response is empty or an explicit "don't know"."""
+        response = user_response.strip()
+        return not response or CONFUSED_RESPONSE_PATTERN.match(response) is not None
+
     async def generate_encouragement(
         self,
         checkpoint_completed: bool,
@@ -3,16 +3,27 @@ LLM service with support for Gemini and Groq (fallback).
 Handles outline generation, dialogue scripting, and compression.
 """
 
-import json
+import asyncio
+import hashlib
+import threading
+import time
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple, Type
 from enum import Enum
 import google.generativeai as genai
-from groq import Groq
+import groq
+import httpx
+import orjson
+from google.api_core import exceptions as google_exceptions
+from groq import AsyncGroq
+from pydantic import BaseModel, ValidationError
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.core.retry import is_retryable_http_error, network_retry
+from app.models.schemas import LLMOutline, LLMDialogueSection, gemini_response_schema
+from app.services.llm_cache import llm_cache
 
 logger = get_logger(__name__)
 
@@ -20,6 +31,45 @@ logger = get_logger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 PROMPTS_DIR = PROJECT_ROOT / "prompts"
 
+# Dialogue generation: one LLM call per outline section, run concurrently
+MAX_CONCURRENT_SECTION_CALLS = 5  # Stay within provider RPM limits
+MIN_TURNS_PER_SECTION = 2
+TOKENS_PER_TURN = 100  # ~45 words of dialogue plus JSON/notes overhead
+
+# Gemini explicit context caching for long shared system instructions
+GEMINI_CONTEXT_CACHE_MIN_CHARS = 8000  # ~2k tokens - below this, implicit caching suffices
+GEMINI_CONTEXT_CACHE_TTL_SECONDS = 600
+
+# Only near-deterministic calls are cached: regenerating creative output
+# (outlines, dialogue, coach replies) for the same input should differ
+CACHE_MAX_TEMPERATURE = 0.3
+
+# Schema retries use a lower temperature (also a fresh cache key)
+SCHEMA_RETRY_TEMPERATURE_DROP = 0.2
+
+# Batch API (pre-generated content: half price, up to 24 h latency)
+GROQ_API_BASE_URL = "https://api.groq.com/openai/v1"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL_SECONDS = 60
+BATCH_FAILED_STATUSES = {"failed", "expired", "cancelled"}
+
+# Transient provider errors worth a backoff retry (rate limits, 5xx, timeouts)
+RETRYABLE_LLM_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    groq.RateLimitError,
+    groq.InternalServerError,
+    groq.APITimeoutError,
+    groq.APIConnectionError,
+)
+
+
+def _is_retryable_llm_error(exc: BaseException) -> bool:
+    """True for rate limits, server errors and timeouts from Gemini or Groq."""
+    return isinstance(exc, RETRYABLE_LLM_ERRORS)
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers."""
@@ -36,6 +86,12 @@ class LLMService:
 
     def __init__(self):
         self.provider = LLMProvider(settings.llm_provider)
+        self.cache = llm_cache
+        # sha256(system_instruction) -> (CachedContent creation task, expiry)
+        self._gemini_context_caches: Dict[str, Tuple[asyncio.Task, float]] = {}
+        # Batch API: batch id -> future resolved by the drain worker
+        self._pending_batches: Dict[str, asyncio.Future] = {}
+        self._batch_worker: Optional[asyncio.Task] = None
         self._setup_clients()
 
     def _setup_clients(self):
@@ -44,8 +100,19 @@ class LLMService:
         genai.configure(api_key=settings.gemini_api_key)
         self.gemini_model = genai.GenerativeModel(settings.gemini_model)
 
-        # Groq setup
-        self.groq_client = Groq(api_key=settings.groq_api_key)
+        # Groq setup (retries handled by network_retry)
+        # Keep-alive HTTP/2 pool shared by every caller (dialogue sections, quiz
+        # questions, hints), sized for their combined concurrent fan-out
+        self.groq_http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=60,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+        self.groq_client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            max_retries=0,
+            http_client=self.groq_http_client,
+        )
 
         logger.info(
             "llm_service_initialized",
@@ -54,6 +121,30 @@ class LLMService:
             groq_model=settings.groq_model,
         )
 
+    async def warm_up(self):
+        """
+        Open provider connections (DNS + TLS) before the first real request.
+
+        Uses free metadata calls: Gemini count_tokens on the async client
+        (which the generate calls reuse) and Groq's model list.
+        """
+        results = await asyncio.gather(
+            self.gemini_model.count_tokens_async("ping"),
+            self.groq_client.models.list(),
+            return_exceptions=True,
+        )
+
+        for provider, result in zip(("gemini", "groq"), results):
+            if isinstance(result, Exception):
+                logger.warning("llm_warm_up_failed", provider=provider, error=str(result))
+
+        logger.info("llm_connections_warmed")
+
+    async def close(self):
+        """Close the shared Groq connection pool."""
+        await self.groq_client.close()
+        logger.info("llm_service_closed")
+
     async def generate(
         self,
         prompt: str,
@@ -61,6 +152,8 @@ class LLMService:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         response_format: Optional[str] = None,  # "json" or None
+        response_schema: Optional[Type[BaseModel]] = None,
+        semantic_key: Optional[str] = None,
     ) -> str:
         """
         Generate text using the configured LLM provider.
@@ -71,10 +164,87 @@ class LLMService:
             temperature: Sampling temperature
             max_tokens: Maximum output tokens
             response_format: "json" to request JSON output
+            response_schema: Pydantic model the JSON must match (Gemini
+                enforces it with constrained decoding)
+            semantic_key: Opt-in to the semantic cache tier. The short text
+                that identifies the request (e.g. a concept name) - a
+                response cached for a near-duplicate key is reused when the
+                rest of the prompt and all other parameters are identical
 
         Returns:
             Generated text
         """
+        result, _ = await self._generate_raw(
+            prompt, system_instruction, temperature, max_tokens,
+            response_format, response_schema, semantic_key
+        )
+        return result
+
+    async def _generate_raw(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[str],
+        response_schema: Optional[Type[BaseModel]] = None,
+        semantic_key: Optional[str] = None,
+    ) -> Tuple[str, Optional[BaseModel]]:
+        """
+        generate(), also returning the response parsed against response_schema.
+
+        A fresh response is validated once to decide whether to cache it, and
+        that parsed model is handed back so callers don't parse it again.
+
+        Returns:
+            Tuple of (generated text, validated model - None on a cache hit,
+            without a schema, or if the response doesn't match the schema)
+        """
+        # Only near-deterministic calls are served from (or stored in) the cache
+        cacheable = temperature <= CACHE_MAX_TEMPERATURE
+
+        # Everything except the prompt - semantic cache matches stay within this
+        cache_params = {
+            "provider": self.provider.value,
+            "model": settings.gemini_model if self.provider == LLMProvider.GEMINI else settings.groq_model,
+            "system_instruction": system_instruction,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            "response_schema": response_schema.__name__ if response_schema else None,
+        }
+        cache_key = self.cache.make_key(prompt=prompt, **cache_params)
+
+        use_semantic = (
+            cacheable
+            and semantic_key is not None
+            and self.cache.uses_semantic_tier(semantic_key)
+        )
+        if use_semantic:
+            # Only the key may differ: the rest of the prompt is part of the namespace
+            semantic_namespace = self.cache.make_key(
+                prompt_template=prompt.replace(semantic_key, ""), **cache_params
+            )
+
+        if cacheable:
+            cached = await self.cache.get(cache_key)
+            if cached is None and use_semantic:
+                cached = await self.cache.get_similar(semantic_namespace, semantic_key)
+                if cached is not None:
+                    self.cache.stats["semantic_hits"] += 1
+
+            if cached is not None:
+                self.cache.stats["hits"] += 1
+                logger.info(
+                    "llm_cache_hit",
+                    provider=self.provider,
+                    prompt_length=len(prompt),
+                    cache_stats=self.cache.stats,
+                )
+                return cached, None
+
+            self.cache.stats["misses"] += 1
+
         logger.info(
             "llm_generate_start",
             provider=self.provider,
@@ -82,14 +252,56 @@ class LLMService:
             temperature=temperature,
         )
 
+        result = await self._generate_uncached(
+            prompt, system_instruction, temperature, max_tokens, response_format, response_schema
+        )
+
+        parsed = None
+        if response_schema is not None:
+            try:
+                parsed = response_schema.model_validate_json(result)
+            except ValidationError as e:
+                # Never cache a response the caller will reject (it would be served for 24h)
+                logger.warning(
+                    "llm_cache_skipped_invalid_response",
+                    schema=response_schema.__name__,
+                    error_count=e.error_count(),
+                )
+                return result, None
+        elif response_format == "json" and cacheable:
+            # Schema-less JSON (e.g. the learning coach): a Groq reply isn't
+            # checked by the provider call, so check it before caching
+            try:
+                orjson.loads(result)
+            except orjson.JSONDecodeError as e:
+                logger.warning("llm_cache_skipped_invalid_response", error=str(e))
+                return result, None
+
+        if cacheable:
+            await self.cache.set(cache_key, result)
+            if use_semantic:
+                self.cache.add_similar_in_background(semantic_namespace, semantic_key, result)
+
+        return result, parsed
+
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[str],
+        response_schema: Optional[Type[BaseModel]] = None,
+    ) -> str:
+        """Call the configured provider, falling back to Groq if Gemini fails."""
         try:
             if self.provider == LLMProvider.GEMINI:
                 return await self._generate_gemini(
-                    prompt, system_instruction, temperature, max_tokens, response_format
+                    prompt, system_instruction, temperature, max_tokens, response_format, response_schema
                 )
             else:
                 return await self._generate_groq(
-                    prompt, system_instruction, temperature, max_tokens, response_format
+                    prompt, system_instruction, temperature, max_tokens, response_format, response_schema
                 )
         except Exception as e:
             logger.error(
@@ -101,10 +313,11 @@ class LLMService:
             if self.provider == LLMProvider.GEMINI:
                 logger.info("attempting_groq_fallback")
                 return await self._generate_groq(
-                    prompt, system_instruction, temperature, max_tokens, response_format
+                    prompt, system_instruction, temperature, max_tokens, response_format, response_schema
                 )
             raise
 
+    @network_retry(_is_retryable_llm_error)
     async def _generate_gemini(
         self,
         prompt: str,
@@ -112,6 +325,7 @@ class LLMService:
         temperature: float,
         max_tokens: int,
         response_format: Optional[str],
+        response_schema: Optional[Type[BaseModel]] = None,
     ) -> str:
         """Generate using Gemini API."""
         from google.generativeai.types import HarmCategory, HarmBlockThreshold
@@ -123,6 +337,9 @@ class LLMService:
 
         if response_format == "json":
             generation_config["response_mime_type"] = "application/json"
+            if response_schema is not None:
+                # Constrained decoding - output is guaranteed to match the schema
+                generation_config["response_schema"] = gemini_response_schema(response_schema)
 
         # Disable safety filters to prevent blocks on educational content
         safety_settings = {
@@ -132,12 +349,21 @@ class LLMService:
             HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
         }
 
-        # Combine system instruction with prompt
+        # Combine system instruction with prompt (the shared prefix also hits
+        # Gemini's implicit caching); long instructions use an explicit cache
+        model = self.gemini_model
         full_prompt = prompt
         if system_instruction:
-            full_prompt = f"{system_instruction}\n\n{prompt}"
+            cached_model = None
+            if len(system_instruction) >= GEMINI_CONTEXT_CACHE_MIN_CHARS:
+                cached_model = await self._get_gemini_cached_model(system_instruction)
+
+            if cached_model is not None:
+                model = cached_model
+            else:
+                full_prompt = f"{system_instruction}\n\n{prompt}"
 
-        response = self.gemini_model.generate_content(
+        response = await model.generate_content_async(
             full_prompt,
             generation_config=generation_config,
             safety_settings=safety_settings,
@@ -145,11 +371,11 @@ class LLMService:
 
         result = response.text
 
-        # Validate JSON if expected
-        if response_format == "json":
+        # Validate JSON if expected (schema-constrained output is already valid)
+        if response_format == "json" and response_schema is None:
             try:
-                json.loads(result)
-            except json.JSONDecodeError as e:
+                orjson.loads(result)
+            except orjson.JSONDecodeError as e:
                 logger.error(
                     "gemini_invalid_json",
                     error=str(e),
@@ -166,15 +392,65 @@ class LLMService:
 
         return result
 
-    async def _generate_groq(
-        self,
+    async def _get_gemini_cached_model(self, system_instruction: str) -> Optional[Any]:
+        """
+        Get a Gemini model bound to a CachedContent holding system_instruction.
+
+        Concurrent calls with the same instruction (e.g. dialogue sections)
+        share a single cache creation.
+
+        Returns:
+            GenerativeModel using the cached prefix, or None if caching failed
+        """
+        key = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+
+        entry = self._gemini_context_caches.get(key)
+        if entry is None or entry[1] <= now:
+            # Drop expired entries before adding a new one
+            self._gemini_context_caches = {
+                k: v for k, v in self._gemini_context_caches.items() if v[1] > now
+            }
+            task = asyncio.create_task(
+                asyncio.to_thread(self._create_gemini_context_cache, system_instruction)
+            )
+            # Expire a minute early so calls never race the server-side TTL
+            entry = (task, now + GEMINI_CONTEXT_CACHE_TTL_SECONDS - 60)
+            self._gemini_context_caches[key] = entry
+
+        try:
+            cached_content = await entry[0]
+        except Exception as e:
+            logger.warning("gemini_context_cache_failed", error=str(e))
+            return None
+
+        return genai.GenerativeModel.from_cached_content(cached_content)
+
+    def _create_gemini_context_cache(self, system_instruction: str):
+        """Create a server-side Gemini context cache (blocking)."""
+        from google.generativeai import caching
+
+        cached_content = caching.CachedContent.create(
+            model=settings.gemini_model,
+            system_instruction=system_instruction,
+            ttl=f"{GEMINI_CONTEXT_CACHE_TTL_SECONDS}s",
+        )
+        logger.info(
+            "gemini_context_cache_created",
+            name=cached_content.name,
+            instruction_length=len(system_instruction),
+        )
+        return cached_content
+
+    @staticmethod
+    def _groq_completion_kwargs(
         prompt: str,
-        system_instruction: Optional[str],
-        temperature: float,
-        max_tokens: int,
-        response_format: Optional[str],
-    ) -> str:
-        """Generate using Groq API."""
+        system_instruction: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        response_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Chat completion body for Groq (shared by live and batch requests)."""
         messages = []
 
         if system_instruction:
@@ -196,9 +472,175 @@ class LLMService:
         }
 
         if response_format == "json":
+            # JSON mode only - the Groq model has no strict json_schema support,
+            # so callers passing response_schema validate the result themselves
             completion_kwargs["response_format"] = {"type": "json_object"}
 
-        response = self.groq_client.chat.completions.create(**completion_kwargs)
+        return completion_kwargs
+
+    async def schedule_batch(self, items: List[Dict[str, Any]]) -> str:
+        """
+        Submit generate() requests to Groq's Batch API.
+
+        Batch jobs cost half as much as live calls but may take up to
+        BATCH_COMPLETION_WINDOW - for pre-generated content only.
+
+        Args:
+            items: generate() kwargs per request (prompt, system_instruction,
+                temperature, max_tokens, response_format)
+
+        Returns:
+            Provider batch id
+        """
+        lines = [
+            orjson.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._groq_completion_kwargs(**item),
+            })
+            for index, item in enumerate(items)
+        ]
+        headers = {"Authorization": f"Bearer {settings.groq_api_key}"}
+
+        upload = await self.groq_http_client.post(
+            f"{GROQ_API_BASE_URL}/files",
+            headers=headers,
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", b"\n".join(lines), "application/jsonl")},
+        )
+        upload.raise_for_status()
+
+        response = await self.groq_http_client.post(
+            f"{GROQ_API_BASE_URL}/batches",
+            headers=headers,
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": BATCH_COMPLETION_WINDOW,
+            },
+        )
+        response.raise_for_status()
+
+        batch_id = response.json()["id"]
+        logger.info("llm_batch_scheduled", batch_id=batch_id, item_count=len(items))
+        return batch_id
+
+    async def get_batch_results(self, batch_id: str) -> Optional[List[Optional[str]]]:
+        """
+        Fetch a batch's results if it has finished.
+
+        Args:
+            batch_id: Id returned by schedule_batch
+
+        Returns:
+            Response texts in submission order (None for failed items),
+            or None while the batch is still running
+        """
+        headers = {"Authorization": f"Bearer {settings.groq_api_key}"}
+
+        response = await self.groq_http_client.get(
+            f"{GROQ_API_BASE_URL}/batches/{batch_id}", headers=headers
+        )
+        response.raise_for_status()
+        batch = response.json()
+
+        status = batch["status"]
+        if status in BATCH_FAILED_STATUSES:
+            raise Exception(f"LLM batch {batch_id} ended with status '{status}'")
+        if status != "completed":
+            return None
+
+        results: List[Optional[str]] = [None] * batch["request_counts"]["total"]
+        if batch.get("output_file_id"):
+            output = await self.groq_http_client.get(
+                f"{GROQ_API_BASE_URL}/files/{batch['output_file_id']}/content",
+                headers=headers,
+            )
+            output.raise_for_status()
+
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                index = int(record["custom_id"])
+                result = record.get("response") or {}
+                if result.get("status_code") == 200:
+                    results[index] = result["body"]["choices"][0]["message"]["content"]
+                else:
+                    logger.warning(
+                        "llm_batch_item_failed",
+                        batch_id=batch_id,
+                        custom_id=record["custom_id"],
+                        error=record.get("error"),
+                    )
+
+        logger.info(
+            "llm_batch_completed",
+            batch_id=batch_id,
+            completed=batch["request_counts"].get("completed"),
+            failed=batch["request_counts"].get("failed"),
+        )
+        return results
+
+    async def generate_batch(self, items: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Run generate() requests through the Batch API and wait for the results.
+
+        Args:
+            items: generate() kwargs per request
+
+        Returns:
+            Response texts in submission order (None for failed items)
+        """
+        batch_id = await self.schedule_batch(items)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_batches[batch_id] = future
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_worker = asyncio.create_task(self._drain_batches())
+
+        return await future
+
+    async def _drain_batches(self):
+        """Background worker: poll pending batches and resolve them as they finish."""
+        while self._pending_batches:
+            await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+
+            for batch_id, future in list(self._pending_batches.items()):
+                try:
+                    results = await self.get_batch_results(batch_id)
+                except Exception as e:
+                    if is_retryable_http_error(e):
+                        # Transient polling failure - try again next round
+                        logger.warning("llm_batch_poll_failed", batch_id=batch_id, error=str(e))
+                        continue
+                    del self._pending_batches[batch_id]
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+
+                if results is not None:
+                    del self._pending_batches[batch_id]
+                    if not future.done():
+                        future.set_result(results)
+
+    @network_retry(_is_retryable_llm_error)
+    async def _generate_groq(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[str],
+        response_schema: Optional[Type[BaseModel]] = None,
+    ) -> str:
+        """Generate using Groq API."""
+        completion_kwargs = self._groq_completion_kwargs(
+            prompt, system_instruction, temperature, max_tokens, response_format
+        )
+
+        response = await self.groq_client.chat.completions.create(**completion_kwargs)
 
         result = response.choices[0].message.content
         logger.info(
@@ -223,10 +665,52 @@ class LLMService:
         Returns:
             Dict with outline (now returns 1 outline instead of 3 for V1 MVP)
         """
-        # Load prompt template
+        request = self._build_outline_request(topic, level, duration, custom_outline)
+        outline = await self._generate_validated(LLMOutline, **request)
+
+        return outline.model_dump()
+
+    async def generate_outlines_batch(
+        self,
+        requests: List[Dict[str, Any]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Generate outlines for bulk, non-urgent courseware via the Batch API.
+
+        Args:
+            requests: generate_outline kwargs per outline (topic, level,
+                duration, custom_outline)
+
+        Returns:
+            Outline dicts in request order (None where generation or
+            validation failed)
+        """
+        items = [
+            {**self._build_outline_request(**request), "response_format": "json"}
+            for request in requests
+        ]
+        results = await self.generate_batch(items)
+
+        outlines: List[Optional[Dict[str, Any]]] = []
+        for request, result in zip(requests, results):
+            try:
+                outlines.append(LLMOutline.model_validate_json(result).model_dump() if result else None)
+            except ValidationError as e:
+                logger.warning("llm_batch_outline_invalid", topic=request.get("topic"), error=str(e))
+                outlines.append(None)
+
+        return outlines
+
+    @staticmethod
+    def _build_outline_request(
+        topic: str,
+        level: str = "adaptive",
+        duration: float = 5.0,
+        custom_outline: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """generate() kwargs for one outline (shared by live and batch paths)."""
+        # Prompt template is referenced by path only (inline prompt below)
         prompt_path = PROMPTS_DIR / "outline_generation.md"
-        with open(prompt_path, "r") as f:
-            prompt_template = f.read()
 
         # Extract system role from template (first section after ## System Role)
         system_instruction = """You are an expert educational content designer specializing in micro-learning and Socratic coaching. Your goal is to create engaging, transformative 5 minute podcast outlines that shift thinking through powerful questions and deep insights."""
@@ -270,15 +754,12 @@ CRITICAL Guidelines for 5 minute format:
 See the full prompt template at: {prompt_path}
 """
 
-        result = await self.generate(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            temperature=0.8,
-            max_tokens=2048,
-            response_format="json",
-        )
-
-        return json.loads(result)
+        return {
+            "prompt": prompt,
+            "system_instruction": system_instruction,
+            "temperature": 0.8,
+            "max_tokens": 2048,
+        }
 
     async def generate_dialogue(
         self,
@@ -291,74 +772,243 @@ See the full prompt template at: {prompt_path}
         """
         Generate Brainy & Snarky dialogue script for 5 minute micro-coaching.
 
+        Each outline section is scripted by its own LLM call and the calls run
+        concurrently, so latency is the slowest section rather than the sum.
+
         Returns:
             Dict with script array and metadata
         """
-        if teaching_materials is None:
-            teaching_materials = []
+        sections_by_index = {}
+        async for index, _, turns in self.stream_dialogue_sections(
+            outline=outline,
+            teaching_materials=teaching_materials,
+            topic=topic,
+            level=level,
+            duration=duration,
+        ):
+            sections_by_index[index] = turns
+
+        # Stitch section scripts in outline order
+        script = [
+            turn
+            for index in sorted(sections_by_index)
+            for turn in sections_by_index[index]
+        ]
+
+        word_count = sum(len(turn.get("text", "").split()) for turn in script)
+        brainy_turns = sum(1 for turn in script if turn.get("speaker") == "Brainy")
+        brainy_percentage = round(100 * brainy_turns / len(script)) if script else 0
+
+        return {
+            "script": script,
+            "metadata": {
+                "estimated_word_count": word_count,
+                "estimated_duration_min": duration,
+                "brainy_percentage": brainy_percentage,
+                "snarky_percentage": 100 - brainy_percentage if script else 0,
+            },
+        }
 
-        system_instruction = """You are writing a dyadic podcast script between:
-- Brainy: Patient, structured teacher who guides understanding through scaffolding. Responds warmly to Snarky's humor while staying focused on teaching.
-- Snarky: Witty, skeptical learner who uses sarcasm and humor to question ideas. Playfully challenges concepts while genuinely curious to understand.
+    async def stream_dialogue_sections(
+        self,
+        outline: Dict[str, Any],
+        teaching_materials: List[Dict[str, Any]] = None,
+        topic: str = "",
+        level: str = "adaptive",
+        duration: float = 5.0,
+    ) -> AsyncIterator[Tuple[int, str, List[Dict[str, Any]]]]:
+        """
+        Generate dialogue per outline section, yielding each section as it completes.
 
-Create engaging, transformative Socratic dialogue with humor and personality. Snarky's sarcasm keeps things fun without being mean."""
+        Sections are generated concurrently and yielded in completion order, so
+        callers can start TTS on early sections while later ones are still being
+        written.
 
-        # Extract Socratic question and key insight from outline if available
-        socratic_question = outline.get("socratic_question", "")
-        key_insight = outline.get("key_insight", "")
+        Yields:
+            Tuple of (section index in outline order, section_id, turns)
+        """
+        if teaching_materials is None:
+            teaching_materials = []
+
+        # Everything shared by the section calls goes in the system instruction,
+        # so it forms one cacheable prefix (see _get_gemini_cached_model)
+        system_instruction = self._build_dialogue_context(
+            outline=outline,
+            teaching_materials=teaching_materials,
+            topic=topic,
+            duration=duration,
+        )
 
         # Calculate target turns based on duration (12 turns per minute for 3-min episodes)
         target_turns = int(duration * 12)  # 3 min = ~36 turns
 
-        prompt = f"""Generate a complete {duration}-minute micro-coaching podcast script.
+        # Episodes without sections are scripted as a single section
+        sections = outline.get("sections") or [{
+            "id": "section_1",
+            "title": outline.get("title", topic),
+            "description": outline.get("description", ""),
+            "learning_outcomes": [],
+        }]
+
+        section_turns = self._split_turns(target_turns, len(sections))
+
+        section_prompts = []
+        turns_so_far = 0
+        for i, (section, turn_count) in enumerate(zip(sections, section_turns), start=1):
+            section_id = section.get("id") or section.get("title") or f"section_{i}"
+            section_prompts.append((
+                section_id,
+                turn_count,
+                self._build_section_prompt(
+                    outline=outline,
+                    section=section,
+                    section_id=section_id,
+                    turn_count=turn_count,
+                    first_speaker="Brainy" if turns_so_far % 2 == 0 else "Snarky",
+                    is_first=i == 1,
+                    is_last=i == len(sections),
+                )
+            ))
+            turns_so_far += turn_count
 
-**Topic**: {topic}
-**Duration**: {duration} minutes (~{int(duration * 180)} words)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SECTION_CALLS)
 
-**Outline**: {json.dumps(outline, indent=2)}
+        async def generate_section(
+            index: int,
+            section_id: str,
+            turn_count: int,
+            prompt: str,
+        ) -> Tuple[int, str, List[Dict[str, Any]]]:
+            try:
+                async with semaphore:
+                    section = await self._generate_validated(
+                        LLMDialogueSection,
+                        prompt=prompt,
+                        system_instruction=system_instruction,
+                        temperature=0.9,
+                        max_tokens=max(800, turn_count * TOKENS_PER_TURN),
+                    )
+            except Exception as e:
+                logger.error("dialogue_section_failed", section_id=section_id, error=str(e))
+                raise Exception(f"Dialogue generation failed for {section_id}: {str(e)}")
+
+            script = [turn.model_dump(mode="json") for turn in section.script]
+            for turn in script:
+                turn["section_id"] = section_id
+            return index, section_id, script
 
-**Teaching Materials**: {json.dumps(teaching_materials, indent=2) if teaching_materials else "None"}
+        logger.info(
+            "generating_dialogue_sections",
+            section_count=len(section_prompts),
+            target_turns=target_turns,
+        )
 
-Return as JSON:
-{{
-  "script": [
-    {{
-      "speaker": "Brainy" or "Snarky",
-      "text": "What they say...",
-      "section_id": "section_1",
-      "notes": "Brief context"
-    }}
-  ],
-  "metadata": {{
-    "estimated_word_count": {int(duration * 180)},
-    "estimated_duration_min": {duration},
-    "brainy_percentage": 60,
-    "snarky_percentage": 40
-  }}
-}}
+        tasks = [
+            asyncio.create_task(generate_section(index, section_id, turn_count, prompt))
+            for index, (section_id, turn_count, prompt) in enumerate(section_prompts)
+        ]
+
+        try:
+            for next_section in asyncio.as_completed(tasks):
+                yield await next_section
+        finally:
+            # Caller stopped early or a section failed - drop the rest
+            for task in tasks:
+                task.cancel()
+
+    async def _generate_validated(
+        self,
+        schema: Type[BaseModel],
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        semantic_key: Optional[str] = None,
+    ) -> BaseModel:
+        """
+        Generate JSON constrained to a schema and validate it, retrying once on a miss.
+
+        Gemini decodes against the schema directly; the validation (and retry)
+        matters for the Groq fallback and truncated responses.
 
-CRITICAL Requirements - APPROXIMATELY {target_turns} TURNS:
+        Args:
+            schema: Pydantic model the response must match
+            prompt: The user prompt
+            system_instruction: System/role instruction
+            temperature: Sampling temperature
+            max_tokens: Maximum output tokens
+            semantic_key: Opt-in semantic cache key (see generate)
 
-Socratic dialogue structure:
-1. Brainy: Transformative opening question (hook) - "{socratic_question}" (30-40 words)
-2. Snarky: Confusion/initial reaction (20-30 words)
-3-{target_turns-2}: Alternate between Brainy and Snarky for:
-   - Scaffolding questions that guide understanding
-   - Partial realizations and "aha!" moments
-   - Concrete analogies and examples
-   - Applications to new contexts
-   - Progressive deepening of insight
-{target_turns-1}. Brainy: Key insight summary - "{key_insight}" (35-45 words)
-{target_turns}. Snarky: Closing reflection/takeaway (20-30 words)
+        Returns:
+            The validated result
 
-Rules:
-- Target {target_turns} turns total (alternating Brainy/Snarky, starting with Brainy)
-- Each turn: 25-45 words (longer turns for 3-minute format)
-- Total: ~{int(duration * 180)} words ({duration} min audio)
-- Include 2-3 concrete analogies throughout
-- Build progressively toward key insight
+        Raises:
+            ValidationError: If the retry also fails validation
+        """
+        try:
+            result, parsed = await self._generate_raw(
+                prompt, system_instruction, temperature, max_tokens, "json", schema, semantic_key
+            )
+            # Fresh responses come back already validated; parse only cache hits
+            # (and re-parse a miss to raise its ValidationError)
+            return parsed if parsed is not None else schema.model_validate_json(result)
+        except ValidationError as e:
+            retry_temperature = max(0.0, temperature - SCHEMA_RETRY_TEMPERATURE_DROP)
+            logger.warning(
+                "llm_schema_validation_failed",
+                error_count=e.error_count(),
+                first_error=str(e.errors()[0].get("msg")),
+                retry_temperature=retry_temperature,
+            )
+
+        result, parsed = await self._generate_raw(
+            prompt, system_instruction, retry_temperature, max_tokens, "json", schema
+        )
+        return parsed if parsed is not None else schema.model_validate_json(result)
+
+    @staticmethod
+    def _split_turns(target_turns: int, section_count: int) -> List[int]:
+        """Spread target turns across sections (earlier sections get the remainder)."""
+        base, remainder = divmod(target_turns, section_count)
+        return [
+            max(MIN_TURNS_PER_SECTION, base + (1 if i < remainder else 0))
+            for i in range(section_count)
+        ]
+
+    def _build_dialogue_context(
+        self,
+        outline: Dict[str, Any],
+        teaching_materials: List[Dict[str, Any]],
+        topic: str,
+        duration: float,
+    ) -> str:
+        """Build the episode-wide instructions shared by every section call."""
+        section_titles = [s.get("title", "") for s in outline.get("sections", [])]
+        # Compact JSON: indentation only adds input tokens
+        teaching_materials_json = orjson.dumps(teaching_materials).decode() if teaching_materials else "None"
+
+        return f"""You are writing a dyadic podcast script between:
+- Brainy: Patient, structured teacher who guides understanding through scaffolding. Responds warmly to Snarky's humor while staying focused on teaching.
+- Snarky: Witty, skeptical learner who uses sarcasm and humor to question ideas. Playfully challenges concepts while genuinely curious to understand.
+
+Create engaging, transformative Socratic dialogue with humor and personality. Snarky's sarcasm keeps things fun without being mean.
+
+The script is a {duration}-minute micro-coaching podcast, written one section at a time.
+
+**Topic**: {topic}
+**Episode Title**: {outline.get("title", "")}
+**Socratic Question**: {outline.get("socratic_question", "")}
+**Key Insight**: {outline.get("key_insight", "")}
+**All Sections (in order)**: {orjson.dumps(section_titles).decode()}
+
+**Teaching Materials**: {teaching_materials_json}
+
+Rules for every section:
+- Turns alternate Brainy/Snarky
+- Each turn: 25-45 words
+- Cover the section's learning outcomes using scaffolding questions, partial realizations, and concrete analogies
+- Build progressively toward the key insight
 - Natural pacing with moments of excitement and reflection
-- IMPORTANT: Assign each turn to the corresponding section_id from the outline (e.g., "section_1", "section_2", etc.)
 
 Concept Markers (IMPORTANT for interactive features):
 - When introducing key concepts, mark them with [CONCEPT: name]
@@ -366,7 +1016,7 @@ Concept Markers (IMPORTANT for interactive features):
 - If no Teaching Materials, mark the most important concepts you discuss
 - Example: "Well, [CONCEPT: Simulation Hypothesis] suggests we might be living in a computer simulation."
 - Only mark concepts on FIRST mention (not every time)
-- Mark 5-8 key concepts throughout the dialogue
+- Mark 1-2 key concepts per section
 - Keep the concept name concise (2-4 words max)
 - Markers enable interactive graph clicks to jump to timestamps
 
@@ -380,16 +1030,84 @@ Character Guidelines:
 - Natural interruptions, reactions, and conversational flow with personality
 """
 
-        result = await self.generate(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            temperature=0.9,
-            max_tokens=3072,
-            response_format="json",
-        )
+    def _build_section_prompt(
+        self,
+        outline: Dict[str, Any],
+        section: Dict[str, Any],
+        section_id: str,
+        turn_count: int,
+        first_speaker: str,
+        is_first: bool,
+        is_last: bool,
+    ) -> str:
+        """Build the dialogue prompt for one outline section."""
+        socratic_question = outline.get("socratic_question", "")
+        key_insight = outline.get("key_insight", "")
+
+        # Where this section sits in the episode
+        placement = []
+        if is_first:
+            placement.append(
+                f'- Turn 1: Brainy opens with the transformative hook question - "{socratic_question}" (30-40 words)\n'
+                "- Turn 2: Snarky reacts with confusion/initial reaction (20-30 words)"
+            )
+        else:
+            placement.append("- This continues an episode already in progress: no greetings or introductions")
+        if is_last:
+            placement.append(
+                f'- Second-to-last turn: Brainy summarizes the key insight - "{key_insight}" (35-45 words)\n'
+                "- Last turn: Snarky gives a closing reflection/takeaway (20-30 words)"
+            )
+        else:
+            placement.append("- Do not wrap up the episode: end leading into the next section")
+
+        placement_rules = "\n".join(placement)
+
+        return f"""Generate ONE section of the podcast script.
+
+**This Section** ({section_id}): {orjson.dumps(section).decode()}
+
+Return as JSON:
+{{
+  "script": [
+    {{
+      "speaker": "Brainy" or "Snarky",
+      "text": "What they say...",
+      "section_id": "{section_id}",
+      "notes": "Brief context"
+    }}
+  ]
+}}
+
+CRITICAL Requirements - EXACTLY {turn_count} TURNS for this section:
+
+Section placement:
+{placement_rules}
+
+Rules:
+- {turn_count} turns, alternating Brainy/Snarky, starting with {first_speaker}
+- Every turn's section_id is "{section_id}"
+"""
+
+
+# Global service instance (created on first use, not at import)
+_llm_service: Optional[LLMService] = None
+_llm_service_lock = threading.Lock()
+
 
-        return json.loads(result)
+async def get_llm_service() -> LLMService:
+    """Get or initialize the global LLM service."""
+    global _llm_service
+    with _llm_service_lock:
+        if _llm_service is None:
+            _llm_service = LLMService()
+    return _llm_service
 
 
-# Global service instance
-llm_service = LLMService()
+async def close_llm_service():
+    """Close the global LLM service's connections, if it was created."""
+    global _llm_service
+    with _llm_service_lock:
+        llm_service, _llm_service = _llm_service, None
+    if llm_service is not None:
+        await llm_service.close()
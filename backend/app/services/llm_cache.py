@@ -0,0 +1,197 @@
+"""
+Response cache for LLMService.generate.
+
+Two tiers:
+- Exact: sha256 of the full request (provider, model, prompts, sampling
+  params) -> response text. Stored in Redis with a TTL, or in a bounded
+  in-process LRU if Redis is unreachable.
+- Semantic (opt-in per call): the caller passes a short semantic key
+  (e.g. a concept name). A near-duplicate key (cosine >= 0.97 on
+  all-MiniLM-L6-v2 embeddings) reuses the cached response, provided the
+  rest of the prompt, the system instruction and the sampling params are
+  identical. Templated prompts are never embedded whole: their shared
+  template would make different requests look like duplicates.
+
+LLMService only caches near-deterministic calls (CACHE_MAX_TEMPERATURE).
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Set
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Cache tuning
+CACHE_TTL_SECONDS = 24 * 60 * 60
+LOCAL_CACHE_MAX_ENTRIES = 1024
+SEMANTIC_SIMILARITY_THRESHOLD = 0.97
+# MiniLM truncates at 256 tokens - longer keys would be compared on a prefix
+SEMANTIC_MAX_KEY_CHARS = 1000
+SEMANTIC_MAX_ENTRIES_PER_NAMESPACE = 512
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+REDIS_KEY_PREFIX = "llm_cache:"
+
+
+class LLMCache:
+    """
+    Exact + semantic cache for LLM responses.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0}
+
+        self._redis = None
+        self._redis_disabled = False
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+
+        # Semantic tier: namespace -> {"embeddings": ndarray, "responses": [...]}
+        self._semantic: Dict[str, Dict[str, Any]] = {}
+        self._embedding_model = None
+        self._semantic_disabled = False
+        self._embedding_lock = asyncio.Lock()
+        # Pending add_similar_in_background tasks (kept so they aren't collected)
+        self._index_tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def make_key(**request_params) -> str:
+        """Build the exact-match key for a generate() request."""
+        payload = json.dumps(request_params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _get_redis(self):
+        """Connect to Redis on first use; disable the tier if unreachable."""
+        if self._redis_disabled:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis
+
+                client = aioredis.from_url(self.redis_url, decode_responses=True)
+                await client.ping()
+                self._redis = client
+                logger.info("llm_cache_redis_connected", url=self.redis_url)
+            except Exception as e:
+                logger.warning("llm_cache_redis_unavailable", error=str(e))
+                self._redis_disabled = True
+                return None
+        return self._redis
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up an exact-match response."""
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                return await redis.get(REDIS_KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning("llm_cache_redis_get_failed", error=str(e))
+
+        value = self._local.get(key)
+        if value is not None:
+            self._local.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str):
+        """Store an exact-match response."""
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                await redis.set(REDIS_KEY_PREFIX + key, value, ex=self.ttl_seconds)
+                return
+            except Exception as e:
+                logger.warning("llm_cache_redis_set_failed", error=str(e))
+
+        self._local[key] = value
+        self._local.move_to_end(key)
+        if len(self._local) > LOCAL_CACHE_MAX_ENTRIES:
+            self._local.popitem(last=False)
+
+    def uses_semantic_tier(self, semantic_key: str) -> bool:
+        """Semantic matching only for keys the embedding model sees in full."""
+        return (
+            not self._semantic_disabled
+            and 0 < len(semantic_key) <= SEMANTIC_MAX_KEY_CHARS
+        )
+
+    async def _embed(self, text: str):
+        """Normalized embedding for a semantic key (model loaded on first use)."""
+        async with self._embedding_lock:
+            if self._embedding_model is None:
+                from sentence_transformers import SentenceTransformer
+
+                self._embedding_model = await asyncio.to_thread(
+                    SentenceTransformer, EMBEDDING_MODEL_NAME
+                )
+                logger.info("llm_cache_embedding_model_loaded", model=EMBEDDING_MODEL_NAME)
+
+        return await asyncio.to_thread(
+            self._embedding_model.encode,
+            text,
+            normalize_embeddings=True
+        )
+
+    async def get_similar(self, namespace: str, semantic_key: str) -> Optional[str]:
+        """Find a cached response for a near-duplicate semantic key."""
+        entries = self._semantic.get(namespace)
+        if not entries:
+            return None
+
+        try:
+            embedding = await self._embed(semantic_key)
+        except Exception as e:
+            logger.warning("llm_cache_semantic_disabled", error=str(e))
+            self._semantic_disabled = True
+            return None
+
+        similarities = entries["embeddings"] @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] >= SEMANTIC_SIMILARITY_THRESHOLD:
+            return entries["responses"][best]
+        return None
+
+    async def add_similar(self, namespace: str, semantic_key: str, value: str):
+        """Index a semantic key/response pair for lookup."""
+        try:
+            import numpy as np
+
+            embedding = await self._embed(semantic_key)
+        except Exception as e:
+            logger.warning("llm_cache_semantic_disabled", error=str(e))
+            self._semantic_disabled = True
+            return
+
+        entries = self._semantic.get(namespace)
+        if entries is None:
+            self._semantic[namespace] = {
+                "embeddings": embedding.reshape(1, -1),
+                "responses": [value],
+            }
+            return
+
+        embeddings = np.vstack([entries["embeddings"], embedding])
+        responses: List[str] = entries["responses"] + [value]
+
+        # Drop the oldest entries beyond the per-namespace cap
+        entries["embeddings"] = embeddings[-SEMANTIC_MAX_ENTRIES_PER_NAMESPACE:]
+        entries["responses"] = responses[-SEMANTIC_MAX_ENTRIES_PER_NAMESPACE:]
+
+    def add_similar_in_background(self, namespace: str, semantic_key: str, value: str):
+        """
+        Index a semantic key/response pair without blocking the caller.
+
+        The first add loads the embedding model (a download on a cold
+        machine), so it shouldn't hold up the response being indexed.
+        """
+        task = asyncio.create_task(self.add_similar(namespace, semantic_key, value))
+        self._index_tasks.add(task)
+        task.add_done_callback(self._index_tasks.discard)
+
+
+# Global cache instance
+llm_cache = LLMCache(redis_url=settings.redis_url)
@@ -1,23 +1,43 @@
 """
 Maya1 TTS client for generating high-quality voices.
 Supports both HuggingFace API and local deployment.
+
+Local deployment (MAYA1_PROVIDER=local) expects a TTS server in front of
+vLLM (e.g. `vllm serve maya-research/maya1 --max-num-seqs 32
+--enable-prefix-caching`) that decodes the generated SNAC codes and returns
+WAV. vLLM's continuous batching packs concurrent turn requests into one
+in-flight batch, and prefix caching reuses the per-speaker voice
+description, so callers should submit all turns at once.
 """
 
 import os
-import requests
-import tempfile
+import threading
+from io import BytesIO
 from typing import Optional
 from pathlib import Path
 
-import soundfile as sf
+import httpx
 from pydub import AudioSegment
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.core.retry import network_retry
 from app.models.voice_profiles import VoiceProfile
 
 logger = get_logger(__name__)
 
+# Shared connection pool for all Maya1 requests (HTTP/2, keep-alive)
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=30,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+)
+
+
+async def close_maya1_http_client():
+    """Close the shared Maya1 connection pool (on app shutdown)."""
+    await _client.aclose()
+
 
 class Maya1Client:
     """
@@ -39,15 +59,16 @@ class Maya1Client:
                 model=self.model_id
             )
         else:
-            # Local deployment (Phase 1)
-            self.api_url = "http://localhost:8002/generate"
+            # Local vLLM-backed deployment
+            self.local_url = os.getenv("MAYA1_LOCAL_URL", "http://localhost:8002")
+            self.api_url = f"{self.local_url}/generate"
             logger.info(
                 "maya1_client_initialized",
                 provider="local",
                 endpoint=self.api_url
             )
 
-    def generate_audio(
+    async def generate_audio(
         self,
         text: str,
         voice_description: str,
@@ -76,11 +97,12 @@ class Maya1Client:
         )
 
         if self.provider == "huggingface_api":
-            return self._generate_hf_api(text, voice_description)
+            return await self._generate_hf_api(text, voice_description)
         else:
-            return self._generate_local(text, voice_description)
+            return await self._generate_local(text, voice_description)
 
-    def _generate_hf_api(self, text: str, voice_description: str) -> AudioSegment:
+    @network_retry()
+    async def _generate_hf_api(self, text: str, voice_description: str) -> AudioSegment:
         """Generate audio via HuggingFace Inference API."""
         headers = {}
         if self.hf_api_key:
@@ -99,30 +121,20 @@ class Maya1Client:
         }
 
         try:
-            response = requests.post(
+            response = await _client.post(
                 self.api_url,
                 headers=headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
 
             if response.status_code == 503:
-                # Model is loading
-                logger.warning("maya1_model_loading", retry_after=20)
-                raise Exception("Maya1 model is loading, please retry in 20 seconds")
+                # Model is loading - raise_for_status below triggers a backoff retry
+                logger.warning("maya1_model_loading")
 
             response.raise_for_status()
 
-            # Save response audio to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-                tmp_file.write(response.content)
-                temp_path = tmp_file.name
-
-            # Load as AudioSegment
-            audio = AudioSegment.from_wav(temp_path)
-
-            # Clean up
-            os.unlink(temp_path)
+            # Decode WAV straight from memory
+            audio = AudioSegment.from_file(BytesIO(response.content), format="wav")
 
             logger.info(
                 "maya1_generate_success",
@@ -140,10 +152,39 @@ class Maya1Client:
             )
             raise
 
-    def _generate_local(self, text: str, voice_description: str) -> AudioSegment:
-        """Generate audio via local Maya1 deployment (Phase 1)."""
-        # This will be implemented in Phase 1
-        raise NotImplementedError("Local Maya1 deployment not yet implemented")
+    @network_retry()
+    async def _generate_local(self, text: str, voice_description: str) -> AudioSegment:
+        """Generate audio via the local vLLM-backed Maya1 server."""
+        # Description first: turns for the same speaker share the prompt prefix
+        payload = {
+            "description": voice_description,
+            "text": text,
+            "temperature": 0.4,
+            "max_tokens": 2048,
+        }
+
+        try:
+            response = await _client.post(self.api_url, json=payload, timeout=120)
+            response.raise_for_status()
+
+            # Decode WAV straight from memory
+            audio = AudioSegment.from_file(BytesIO(response.content), format="wav")
+
+            logger.info(
+                "maya1_generate_success",
+                audio_duration_ms=len(audio),
+                provider="local"
+            )
+
+            return audio
+
+        except Exception as e:
+            logger.error(
+                "maya1_generate_failed",
+                error=str(e),
+                provider="local"
+            )
+            raise
 
     def test_connection(self) -> bool:
         """Test if Maya1 service is accessible."""
@@ -154,7 +195,8 @@ class Maya1Client:
                 if self.hf_api_key:
                     headers["Authorization"] = f"Bearer {self.hf_api_key}"
 
-                response = requests.get(
+                # Runs once at startup (sync), so a one-off request is fine here
+                response = httpx.get(
                     self.api_url,
                     headers=headers,
                     timeout=5
@@ -165,6 +207,11 @@ class Maya1Client:
                 if response.status_code in [200, 503]:
                     logger.info("maya1_connection_test_passed")
                     return True
+            else:
+                response = httpx.get(f"{self.local_url}/health", timeout=5)
+                if response.status_code == 200:
+                    logger.info("maya1_connection_test_passed", provider="local")
+                    return True
 
             return False
 
@@ -173,5 +220,15 @@ class Maya1Client:
             return False
 
 
-# Global client instance
-maya1_client = Maya1Client()
+# Global client instance (created on first use, not at import)
+_maya1_client: Optional[Maya1Client] = None
+_maya1_client_lock = threading.Lock()
+
+
+def get_maya1_client() -> Maya1Client:
+    """Get or initialize the global Maya1 client."""
+    global _maya1_client
+    with _maya1_client_lock:
+        if _maya1_client is None:
+            _maya1_client = Maya1Client()
+    return _maya1_client
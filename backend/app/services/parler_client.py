@@ -6,11 +6,11 @@ and uses natural language voice descriptions for Brainy and Snarky.
 """
 
 import os
-import requests
-import tempfile
-from typing import Optional
-from pathlib import Path
+import zipfile
+from io import BytesIO
+from typing import Optional, List, Dict, Tuple
 
+import httpx
 from pydub import AudioSegment
 from dotenv import load_dotenv
 
@@ -18,10 +18,41 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app.core.logging_config import get_logger
+from app.core.retry import network_retry
 from app.models.voice_profiles import VoiceProfile
 
 logger = get_logger(__name__)
 
+NGROK_HEADERS = {"ngrok-skip-browser-warning": "true"}
+
+# Max turns per /generate_batch request (larger scripts are split)
+PARLER_MAX_BATCH_SIZE = 32
+
+# Shared connection pool for all Parler requests (HTTP/2, keep-alive)
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=120,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    headers=NGROK_HEADERS,
+)
+
+
+async def close_parler_http_client():
+    """Close the shared Parler connection pool (on app shutdown)."""
+    await _client.aclose()
+
+
+class ParlerBatchUnsupported(Exception):
+    """Raised when the Parler server has no /generate_batch endpoint."""
+
+
+def _batch_member_order(name: str) -> Tuple[bool, int, str]:
+    """Sort key for batch ZIP members: numbered files by index, anything else after."""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if stem.isdigit():
+        return (False, int(stem), name)
+    return (True, 0, name)
+
 
 class ParlerClient:
     """
@@ -37,13 +68,12 @@ class ParlerClient:
 
         logger.info("parler_client_initialized", server_url=self.server_url)
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """Test if Parler TTS server is accessible."""
         try:
-            response = requests.get(
+            response = await _client.get(
                 f"{self.server_url}/health",
-                timeout=5,
-                headers={"ngrok-skip-browser-warning": "true"}
+                timeout=5
             )
 
             if response.status_code == 200:
@@ -62,11 +92,26 @@ class ParlerClient:
                 )
                 return False
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.warning("parler_connection_test_failed", error=str(e))
             return False
 
-    def generate_audio(
+    async def _post_once(self, path: str, payload: Dict, timeout: int) -> httpx.Response:
+        """POST to the Parler server (no retries)."""
+        response = await _client.post(
+            f"{self.server_url}{path}",
+            json=payload,
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response
+
+    @network_retry()
+    async def _post(self, path: str, payload: Dict, timeout: int) -> httpx.Response:
+        """POST to the Parler server, retrying 429/5xx/timeouts with backoff."""
+        return await self._post_once(path, payload, timeout)
+
+    async def generate_audio(
         self,
         text: str,
         speaker: str,  # "Brainy" or "Snarky"
@@ -95,31 +140,17 @@ class ParlerClient:
 
         try:
             # Call Parler TTS server
-            response = requests.post(
-                f"{self.server_url}/generate",
-                json={
+            response = await self._post(
+                "/generate",
+                {
                     "text": text,
                     "speaker": speaker
                 },
-                timeout=timeout,
-                headers={"ngrok-skip-browser-warning": "true"}
+                timeout
             )
 
-            response.raise_for_status()
-
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-                tmp_file.write(response.content)
-                tmp_path = tmp_file.name
-
-            # Load as AudioSegment
-            audio = AudioSegment.from_wav(tmp_path)
-
-            # Cleanup
-            try:
-                os.unlink(tmp_path)
-            except Exception as e:
-                logger.warning("failed_to_cleanup_temp_file", path=tmp_path, error=str(e))
+            # Decode WAV straight from memory
+            audio = AudioSegment.from_file(BytesIO(response.content), format="wav")
 
             logger.info(
                 "parler_generate_success",
@@ -130,12 +161,12 @@ class ParlerClient:
 
             return audio
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             error_msg = f"Parler TTS request timed out after {timeout}s"
             logger.error("parler_timeout", error=error_msg, speaker=speaker)
             raise Exception(error_msg)
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             error_msg = f"Parler TTS request failed: {str(e)}"
             logger.error("parler_request_failed", error=error_msg, speaker=speaker)
             raise Exception(error_msg)
@@ -145,6 +176,91 @@ class ParlerClient:
             logger.error("parler_generation_failed", error=error_msg, speaker=speaker)
             raise Exception(error_msg)
 
+    async def generate_audio_batch(
+        self,
+        turns: List[Dict[str, str]],
+        timeout: int = 600,
+    ) -> List[AudioSegment]:
+        """
+        Generate audio for many turns with one request per batch.
+
+        Sends up to PARLER_MAX_BATCH_SIZE turns per POST to /generate_batch so the
+        server pays model/tokenizer/kernel setup once per batch instead of per turn.
+        The server returns a ZIP with one WAV per turn, named by index ("0.wav", ...).
+
+        Args:
+            turns: List of {"text": ..., "speaker": ...} dicts
+            timeout: Request timeout in seconds (per batch)
+
+        Returns:
+            AudioSegments in the same order as turns
+
+        Raises:
+            ParlerBatchUnsupported: If the server has no batch endpoint
+            Exception: If generation fails
+        """
+        segments = []
+        for start in range(0, len(turns), PARLER_MAX_BATCH_SIZE):
+            batch = turns[start:start + PARLER_MAX_BATCH_SIZE]
+            segments.extend(await self._generate_batch_chunk(batch, timeout))
+        return segments
+
+    async def _generate_batch_chunk(
+        self,
+        batch: List[Dict[str, str]],
+        timeout: int,
+    ) -> List[AudioSegment]:
+        """Generate one batch (at most PARLER_MAX_BATCH_SIZE turns)."""
+        logger.info(
+            "parler_batch_request",
+            batch_size=len(batch),
+            server=self.server_url
+        )
+
+        try:
+            try:
+                # Not retried: a stuck batch would hold the episode for several
+                # full timeouts, and any failure falls back to per-turn requests
+                response = await self._post_once("/generate_batch", {"items": batch}, timeout)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status in (404, 405):
+                    raise ParlerBatchUnsupported(
+                        f"Parler server has no /generate_batch endpoint (HTTP {status})"
+                    )
+                raise
+
+            # One WAV per turn, named by index within the batch
+            with zipfile.ZipFile(BytesIO(response.content)) as archive:
+                names = sorted(archive.namelist(), key=_batch_member_order)
+                segments = [
+                    AudioSegment.from_file(BytesIO(archive.read(name)), format="wav")
+                    for name in names
+                ]
+
+            if len(segments) != len(batch):
+                raise Exception(
+                    f"expected {len(batch)} audio files but got {len(segments)}"
+                )
+
+            logger.info(
+                "parler_batch_success",
+                batch_size=len(batch),
+                response_size=len(response.content)
+            )
+
+            return segments
+
+        except ParlerBatchUnsupported:
+            raise
+
+        except httpx.TimeoutException:
+            error_msg = f"Parler TTS batch request timed out after {timeout}s"
+            logger.error("parler_batch_timeout", error=error_msg, batch_size=len(batch))
+            raise Exception(error_msg)
+
+        except Exception as e:
+            error_msg = f"Parler TTS batch generation failed: {str(e)}"
+            logger.error("parler_batch_failed", error=error_msg, batch_size=len(batch))
+            raise Exception(error_msg)
 
-# Global client instance
-parler_client = ParlerClient()
@@ -7,13 +7,66 @@ Uses LLM to create engaging questions with:
 - Concept-based question generation
 """
 
-import json
+import asyncio
+import heapq
 from typing import List, Dict, Any, Optional
 
+import orjson
+from pydantic import ValidationError
+
 from app.core.logging_config import get_logger
+from app.models.schemas import LLMQuizQuestion
 
 logger = get_logger(__name__)
 
+# One LLM call per question, bounded to respect provider rate limits
+MAX_CONCURRENT_QUESTION_CALLS = 10
+
+# Document text included in each question prompt
+QUESTION_DOCUMENT_EXCERPT_CHARS = 1500
+
+# Static question-format instructions (shared prefix of every question call)
+QUESTION_SYSTEM_INSTRUCTION = """You are an expert educational assessment designer who creates quiz questions in valid JSON format.
+CRITICAL: You MUST return ONLY valid JSON: a single complete JSON object.
+Do NOT use shorthand syntax. Do NOT use comma-separated key-value pairs.
+
+Return a valid JSON object in this format:
+{
+  "question": "What is the main idea?",
+  "options": [
+    {"id": "a", "text": "Correct answer"},
+    {"id": "b", "text": "Wrong answer 1"},
+    {"id": "c", "text": "Wrong answer 2"},
+    {"id": "d", "text": "Wrong answer 3"}
+  ],
+  "correct_answer": "a",
+  "explanation": "Explanation text",
+  "hints": [
+    {"level": 1, "type": "nudge", "text": "Hint 1"},
+    {"level": 2, "type": "partial", "text": "Hint 2"},
+    {"level": 3, "type": "explicit", "text": "Hint 3"}
+  ],
+  "difficulty": "medium",
+  "distractor_hints": [
+    {
+      "option_id": "b",
+      "wrong_answer_reasoning": "2-3 sentences on why this option is incorrect",
+      "level_1": ["Subtle question about the assumption behind picking this option", "..."],
+      "level_2": ["Clearer question that narrows down the options", "..."],
+      "level_3": ["Explicit question that almost points to the answer", "..."],
+      "guiding_questions": ["What key concept or fact should they recall?"]
+    }
+  ]
+}
+
+CRITICAL Requirements:
+- Options should be similar length and complexity
+- Distractors must be plausible but clearly wrong upon reflection
+- Hints must be graduated: Level 1 (subtle) → Level 2 (moderate) → Level 3 (explicit)
+- Option IDs: a, b, c, d (always 4 options)
+- Difficulty: easy/medium/hard based on concept complexity
+- distractor_hints: one entry per wrong option, 2-3 concise Socratic questions per level, the first referencing the selected option"""
+
 
 class QuizGenerator:
     """
@@ -28,33 +81,46 @@ class QuizGenerator:
         self,
         concepts: List[Dict[str, Any]],
         document_text: str,
-        target_question_count: int = 5
+        target_question_count: int = 5,
+        validate_input: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Generate quiz questions from document concepts.
 
         Args:
-            concepts: List of concepts extracted from document
+            concepts: List of concept dicts extracted from document
             document_text: Full document text for context
             target_question_count: Number of questions to generate (default: 5)
+            validate_input: Check the shape of concepts first. Off by default:
+                callers pass ConceptExtractor output, which the quiz endpoint
+                already validates
 
         Returns:
             List of question dictionaries with answers, hints, and metadata
         """
-        # Validate input - fail fast if concepts is not a list
-        if not isinstance(concepts, list):
-            logger.error("invalid_concepts_type",
-                       type=type(concepts).__name__,
-                       data_preview=str(concepts)[:200])
-            raise ValueError(f"Expected list of concepts but got {type(concepts).__name__}")
-
-        # Validate that concepts list contains dictionaries, not strings
-        if len(concepts) > 0 and not isinstance(concepts[0], dict):
-            logger.error("invalid_concept_item_type",
-                       type=type(concepts[0]).__name__,
-                       first_item=str(concepts[0])[:100],
-                       concepts_preview=str(concepts)[:200])
-            raise ValueError(f"Expected list of concept dicts but got list of {type(concepts[0]).__name__}")
+        if validate_input:
+            # Validate input - fail fast if concepts is not a list
+            if not isinstance(concepts, list):
+                logger.error("invalid_concepts_type",
+                           type=type(concepts).__name__,
+                           data_preview=str(concepts)[:200])
+                raise ValueError(f"Expected list of concepts but got {type(concepts).__name__}")
+
+            # Validate that concepts list contains dictionaries, not strings
+            if len(concepts) > 0 and not isinstance(concepts[0], dict):
+                logger.error("invalid_concept_item_type",
+                           type=type(concepts[0]).__name__,
+                           first_item=str(concepts[0])[:100],
+                           concepts_preview=str(concepts)[:200])
+                raise ValueError(f"Expected list of concept dicts but got list of {type(concepts[0]).__name__}")
+
+        if not concepts or target_question_count <= 0:
+            logger.info(
+                "quiz_generation_skipped_empty",
+                concept_count=len(concepts),
+                target_questions=target_question_count
+            )
+            return []
 
         logger.info(
             "generating_quiz",
@@ -94,16 +160,13 @@ class QuizGenerator:
         Returns:
             Top N concepts sorted by importance
         """
-        # Sort by importance (descending)
-        sorted_concepts = sorted(
+        # Top N by importance (partial selection - no full sort)
+        selected = heapq.nlargest(
+            count,
             concepts,
-            key=lambda c: c.get('importance', 0),
-            reverse=True
+            key=lambda c: c.get('importance', 0)
         )
 
-        # Take top N
-        selected = sorted_concepts[:count]
-
         logger.debug(
             "concepts_selected_for_quiz",
             total_concepts=len(concepts),
@@ -120,7 +183,11 @@ class QuizGenerator:
         target_count: int
     ) -> List[Dict[str, Any]]:
         """
-        Generate multiple-choice questions using LLM.
+        Generate multiple-choice questions using LLM, one call per question.
+
+        The calls run concurrently (bounded by MAX_CONCURRENT_QUESTION_CALLS),
+        so latency is roughly one question's call instead of the whole quiz's, and a
+        malformed response only loses its own question.
 
         Args:
             concepts: Selected concepts to generate questions for
@@ -130,118 +197,110 @@ class QuizGenerator:
         Returns:
             List of question dictionaries
         """
-        # Build concept context for LLM
-        concept_context = "\n".join([
-            f"- {c['name']}: {c.get('definition', '')}"
-            for c in concepts
-        ])
-
-        system_instruction = """You are an expert educational assessment designer who creates quiz questions in valid JSON format.
-CRITICAL: You MUST return ONLY valid JSON. Each question in the array must be a complete JSON object.
-Do NOT use shorthand syntax. Do NOT use comma-separated key-value pairs.
-Every question must follow standard JSON object format with proper structure."""
-
-        prompt = f"""Generate EXACTLY {target_count} multiple-choice quiz questions from the document concepts below.
-
-**Document Excerpt**:
-{document_text[:1500]}...
-
-**Key Concepts**:
-{concept_context}
-
-Return a valid JSON array. Each question must be a complete object in the array.
-
-Example of correct format:
-[
-  {{
-    "question_id": "q1",
-    "concept_id": "c1",
-    "concept_name": "Example Concept",
-    "question": "What is the main idea?",
-    "options": [
-      {{"id": "a", "text": "Correct answer"}},
-      {{"id": "b", "text": "Wrong answer 1"}},
-      {{"id": "c", "text": "Wrong answer 2"}},
-      {{"id": "d", "text": "Wrong answer 3"}}
-    ],
-    "correct_answer": "a",
-    "explanation": "Explanation text",
-    "hints": [
-      {{"level": 1, "type": "nudge", "text": "Hint 1"}},
-      {{"level": 2, "type": "partial", "text": "Hint 2"}},
-      {{"level": 3, "type": "explicit", "text": "Hint 3"}}
-    ],
-    "difficulty": "medium",
-    "audio_timestamp": null
-  }}
-]
+        if not concepts or target_count <= 0:
+            return []
+
+        # Sliced once and shared by every question prompt
+        document_excerpt = document_text[:QUESTION_DOCUMENT_EXCERPT_CHARS]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUESTION_CALLS)
+
+        async def generate_one(index: int) -> Dict[str, Any]:
+            # More questions than concepts: cycle through the concepts
+            concept = concepts[index % len(concepts)]
+            async with semaphore:
+                question = await self._generate_question(
+                    concept,
+                    document_excerpt,
+                    variant=index // len(concepts)
+                )
+
+            # Enrich with concept metadata as soon as the question arrives
+            question['concept_id'] = concept['id']
+            question['concept_name'] = concept['name']
+            question['audio_timestamp'] = concept.get('absolute_timestamp') or None
+            return question
+
+        results = await asyncio.gather(
+            *[generate_one(i) for i in range(target_count)],
+            return_exceptions=True
+        )
 
-CRITICAL Requirements:
-- Generate EXACTLY {target_count} questions
-- Each question tests ONE concept from the list
-- Options should be similar length and complexity
-- Distractors must be plausible but clearly wrong upon reflection
-- Hints must be graduated: Level 1 (subtle) → Level 2 (moderate) → Level 3 (explicit)
-- Include audio_timestamp from concept data if available
-- Question IDs: q1, q2, q3, etc.
-- Option IDs: a, b, c, d (always 4 options)
-- Difficulty: easy/medium/hard based on concept complexity
-"""
+        questions = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "quiz_question_generation_failed",
+                    question_index=index,
+                    error=str(result)
+                )
+                continue
+            questions.append(result)
 
-        result = await self.llm_service.generate(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            temperature=0.3,  # Lower temperature for more reliable JSON
-            max_tokens=3072,
-            response_format="json"
-        )
+        if not questions:
+            raise ValueError("LLM failed to generate any quiz questions")
 
-        # Parse LLM response and handle both array and object formats
-        parsed_result = json.loads(result)
-
-        # Handle Gemini wrapping response in object
-        if isinstance(parsed_result, dict):
-            if 'questions' in parsed_result:
-                questions = parsed_result['questions']
-            else:
-                # Single question object, wrap in array
-                questions = [parsed_result]
-        else:
-            questions = parsed_result
-
-        # Validate it's now a list
-        if not isinstance(questions, list):
-            logger.error(
-                "quiz_questions_invalid_type",
-                type=type(questions).__name__,
-                data=str(questions)[:300]
-            )
-            raise ValueError(f"Expected list of questions but got {type(questions).__name__}")
+        # IDs follow the final order (failed questions leave no gaps)
+        for i, q in enumerate(questions, start=1):
+            q['question_id'] = f"q{i}"
 
         logger.info(
-            "llm_quiz_response_parsed",
-            response_type=type(questions).__name__,
+            "questions_generated_via_llm",
             question_count=len(questions),
-            first_question_preview=str(questions[0])[:200] if len(questions) > 0 else "empty"
+            failed_count=target_count - len(questions)
         )
 
-        # Enrich questions with concept metadata
-        concept_map = {c['id']: c for c in concepts}
-        for q in questions:
-            concept = concept_map.get(q['concept_id'])
-            if concept:
-                # Add timestamp if available
-                if 'absolute_timestamp' in concept and concept['absolute_timestamp']:
-                    q['audio_timestamp'] = concept['absolute_timestamp']
-                else:
-                    q['audio_timestamp'] = None
+        return questions
 
-        logger.info(
-            "questions_generated_via_llm",
-            question_count=len(questions)
+    async def _generate_question(
+        self,
+        concept: Dict[str, Any],
+        document_excerpt: str,
+        variant: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Generate one multiple-choice question for a concept.
+
+        Args:
+            concept: Concept the question tests
+            document_excerpt: Leading QUESTION_DOCUMENT_EXCERPT_CHARS of the document
+            variant: Number of earlier questions on this concept (asks for
+                a different aspect, and keeps the prompt's cache key distinct)
+
+        Returns:
+            Question dictionary
+        """
+        # Excerpt first, concept last: every question call for a document
+        # shares the system instruction + excerpt prefix
+        prompt = f"""**Document Excerpt**:
+{document_excerpt}...
+
+Generate ONE multiple-choice quiz question testing this concept:
+**Concept**: {concept['name']}: {concept.get('definition', '')}
+"""
+        if variant:
+            prompt += f"\nThis is question {variant + 1} on this concept: test a different aspect than a basic definition check.\n"
+
+        result = await self.llm_service.generate(
+            prompt=prompt,
+            system_instruction=QUESTION_SYSTEM_INSTRUCTION,
+            temperature=0.3,  # Lower temperature for more reliable JSON
+            max_tokens=2048,  # Question + Socratic hints for each wrong option
+            response_format="json",
+            response_schema=LLMQuizQuestion
         )
 
-        return questions
+        try:
+            question = LLMQuizQuestion.model_validate_json(result)
+        except ValidationError:
+            # The model wrapped the question in an object/array
+            parsed = orjson.loads(result)
+            if isinstance(parsed, dict) and 'questions' in parsed:
+                parsed = parsed['questions']
+            if isinstance(parsed, list) and len(parsed) > 0:
+                parsed = parsed[0]
+            question = LLMQuizQuestion.model_validate(parsed)
+
+        return question.model_dump()
 
 
 # Function to create quiz generator instance
@@ -8,12 +8,76 @@ Generates targeted Socratic questions that:
 - Integrate WebSearch for enriched context
 """
 
-import json
-from typing import Dict, List, Any, Optional
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from pydantic import ValidationError
+
 from app.core.logging_config import get_logger
+from app.models.schemas import LLMSocraticHint
 
 logger = get_logger(__name__)
 
+# Background hint prefetching limits
+MAX_CONCURRENT_PREFETCHES = 2
+MAX_PREFETCHED_HINTS = 64
+
+# Concept summaries kept in memory (hint levels 1-3 reuse the same search)
+MAX_CACHED_CONCEPT_SEARCHES = 512
+
+# Document text included in each hint prompt (callers may pass just this
+# prefix; slicing a string that is already short enough doesn't copy it)
+HINT_DOCUMENT_EXCERPT_CHARS = 500
+
+CONCEPT_SEARCH_SYSTEM_INSTRUCTION = "You are a concise educational resource that explains concepts clearly."
+
+# Static hint instructions (kept out of the per-hint prompt so they form a
+# cacheable prefix)
+HINT_SYSTEM_INSTRUCTION = """You are a Socratic teaching expert who helps learners
+discover understanding through thoughtful questioning, not direct answers. Your goal is to
+help students realize why their answer is wrong and guide them to the correct answer through
+their own reasoning.
+
+Generate a JSON response with:
+{
+  "wrong_answer_reasoning": "Explain in 2-3 sentences why their selected answer is incorrect. Be clear and specific about what makes it wrong.",
+  "socratic_questions": [
+    "You selected '<their answer text>' - [Question that reveals assumption or contradiction]",
+    "[Question that hints at what they should consider]",
+    "[Question that guides toward correct reasoning]"
+  ],
+  "guiding_questions": [
+    "[What key concept or fact should they recall?]",
+    "[What relationship or connection are they missing?]"
+  ],
+  "search_context_summary": "Brief 1-2 sentence summary of web search findings (if available, otherwise empty string)"
+}
+
+IMPORTANT:
+- Make socratic_questions specific to their wrong answer
+- Reference their selected option in at least the first question
+- For Level 1: Be subtle, question assumptions
+- For Level 2: Be clearer, narrow down options
+- For Level 3: Be explicit, almost point to answer
+- Keep all text concise and focused"""
+
+# Hint level characteristics
+HINT_LEVEL_INSTRUCTIONS = {
+    1: """Level 1 (Subtle): Question their assumptions gently. Don't reveal the answer.
+    - Ask why they might have thought this
+    - Point out contradictions in their logic
+    - Hint at what they should consider""",
+    2: """Level 2 (Moderate): Be more direct but still Socratic.
+    - Explain why their answer is incorrect
+    - Eliminate 1-2 obviously wrong options
+    - Guide them toward key concepts they missed""",
+    3: """Level 3 (Explicit): Almost reveal the answer through guidance.
+    - Clearly explain why their answer fails
+    - Point directly to the correct reasoning
+    - Leave only minimal discovery work for them"""
+}
+
 
 class SocraticHintGenerator:
     """
@@ -26,6 +90,14 @@ class SocraticHintGenerator:
             llm_service: LLMService instance for hint generation
         """
         self.llm = llm_service
+
+        # Hints generated ahead of time for the next likely hint level
+        self._prefetched_hints: Dict[Tuple, asyncio.Task] = {}
+        self._prefetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PREFETCHES)
+
+        # Normalized concept name -> search task (LRU; in-flight searches are shared)
+        self._concept_searches: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+
         logger.info("socratic_hint_generator_initialized")
 
     async def generate_socratic_hint(
@@ -56,27 +128,210 @@ class SocraticHintGenerator:
             hint_level=hint_level
         )
 
-        # Get option texts
-        selected_option_obj = next(
-            (o for o in question['options'] if o['id'] == selected_option),
+        # Use the prefetched hint if one was started for this answer
+        prefetched = self._prefetched_hints.pop(
+            self._prefetch_key(question, selected_option, hint_level),
             None
         )
-        correct_option_obj = next(
-            (o for o in question['options'] if o['id'] == question['correct_answer']),
-            None
+        if prefetched is not None:
+            hint_data = await prefetched
+            if hint_data is not None:
+                logger.info(
+                    "socratic_hint_served_from_prefetch",
+                    question_id=question.get('question_id'),
+                    hint_level=hint_level
+                )
+                return hint_data
+
+        return await self._build_socratic_hint(
+            question=question,
+            selected_option=selected_option,
+            hint_level=hint_level,
+            document_context=document_context,
+            use_web_search=use_web_search
+        )
+
+    async def generate_socratic_hints_batch(
+        self,
+        items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate hints for several wrong answers concurrently (e.g. a review page).
+
+        WebSearch runs once per distinct concept and is shared by that
+        concept's hints. A failed item gets a fallback hint without
+        affecting the others.
+
+        Args:
+            items: generate_socratic_hint kwargs per wrong answer (question,
+                selected_option, hint_level, document_context, use_web_search)
+
+        Returns:
+            Hint dicts in item order
+        """
+        search_tasks: Dict[str, asyncio.Task] = {}
+        for item in items:
+            if item.get('use_web_search', True):
+                concept_name = item['question'].get('concept_name', '')
+                if concept_name not in search_tasks:
+                    search_tasks[concept_name] = asyncio.create_task(
+                        self._search_web_for_concept(concept_name)
+                    )
+
+        results = await asyncio.gather(
+            *[
+                self._build_socratic_hint(
+                    question=item['question'],
+                    selected_option=item['selected_option'],
+                    hint_level=item['hint_level'],
+                    document_context=item['document_context'],
+                    use_web_search=item.get('use_web_search', True),
+                    search_task=search_tasks.get(item['question'].get('concept_name', ''))
+                )
+                for item in items
+            ],
+            return_exceptions=True
         )
 
+        hints = []
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.error("socratic_hint_batch_item_failed", error=str(result))
+                result = self._create_fallback_hint(item['question'], item['hint_level'])
+            hints.append(result)
+
+        logger.info("socratic_hints_batch_generated", count=len(hints))
+        return hints
+
+    def prefetch_socratic_hint(
+        self,
+        question: Dict[str, Any],
+        selected_option: str,
+        hint_level: int,
+        document_context: str,
+        use_web_search: bool = True
+    ) -> None:
+        """
+        Start generating a hint in the background before the user asks for it.
+
+        The next hint level for a wrong answer is predictable, so it is generated
+        while the user reads the current hint. generate_socratic_hint() picks up
+        the result when it is requested.
+
+        Args:
+            question: The quiz question dict
+            selected_option: The user's selected option ID
+            hint_level: Hint level to prefetch (ignored if above 3)
+            document_context: Original document text for context
+            use_web_search: Whether to enrich with WebSearch
+        """
+        if hint_level > 3:
+            return
+
+        key = self._prefetch_key(question, selected_option, hint_level)
+        if key in self._prefetched_hints:
+            return
+
+        # Drop the oldest prefetch if the user never asked for it
+        if len(self._prefetched_hints) >= MAX_PREFETCHED_HINTS:
+            oldest_key = next(iter(self._prefetched_hints))
+            self._prefetched_hints.pop(oldest_key).cancel()
+
+        async def run_prefetch() -> Optional[Dict[str, Any]]:
+            async with self._prefetch_semaphore:
+                try:
+                    return await self._build_socratic_hint(
+                        question=question,
+                        selected_option=selected_option,
+                        hint_level=hint_level,
+                        document_context=document_context,
+                        use_web_search=use_web_search
+                    )
+                except Exception as e:
+                    logger.warning("socratic_hint_prefetch_failed", error=str(e))
+                    return None
+
+        self._prefetched_hints[key] = asyncio.create_task(run_prefetch())
+
+        logger.info(
+            "socratic_hint_prefetch_started",
+            question_id=question.get('question_id'),
+            hint_level=hint_level
+        )
+
+    def prewarm_concept_searches(self, questions: List[Dict[str, Any]]) -> None:
+        """
+        Start concept searches for a new quiz in the background.
+
+        Only questions without pregenerated distractor_hints will need the
+        live hint path (and its search), so only their concepts are searched.
+        Later hint requests find the results in the search cache.
+
+        Args:
+            questions: The quiz's generated questions
+        """
+        concept_names = {
+            q['concept_name'] for q in questions
+            if q.get('concept_name') and not q.get('distractor_hints')
+        }
+        for concept_name in concept_names:
+            self._get_concept_search_task(concept_name)
+
+        if concept_names:
+            logger.info("concept_search_prewarm_started", concept_count=len(concept_names))
+
+    def _prefetch_key(
+        self,
+        question: Dict[str, Any],
+        selected_option: str,
+        hint_level: int
+    ) -> Tuple:
+        """Key identifying a hint for one wrong answer (question IDs repeat across quizzes)."""
+        return (question.get('question_id'), question.get('question'), selected_option, hint_level)
+
+    async def _build_socratic_hint(
+        self,
+        question: Dict[str, Any],
+        selected_option: str,
+        hint_level: int,
+        document_context: str,
+        use_web_search: bool,
+        search_task: Optional[asyncio.Task] = None
+    ) -> Dict[str, Any]:
+        """Generate a Socratic hint (option lookup, WebSearch, LLM call).
+
+        search_task is an already-started WebSearch for the question's
+        concept, shared across a batch; otherwise the search runs here.
+        """
+        # Get option texts
+        options_by_id = {o['id']: o for o in question['options']}
+        selected_option_obj = options_by_id.get(selected_option)
+        correct_option_obj = options_by_id.get(question['correct_answer'])
+
         if not selected_option_obj or not correct_option_obj:
             logger.error("option_not_found", selected=selected_option, correct=question['correct_answer'])
             return self._create_fallback_hint(question, hint_level)
 
+        # Hints generated along with the question need no LLM call
+        pregenerated = self._get_pregenerated_hint(question, selected_option, hint_level)
+        if pregenerated is not None:
+            if use_web_search and question.get('concept_name'):
+                pregenerated['search_url'] = self._search_url(question['concept_name'])
+            logger.info(
+                "socratic_hint_served_pregenerated",
+                question_id=question.get('question_id'),
+                hint_level=hint_level
+            )
+            return pregenerated
+
         # WebSearch for concept context (if enabled)
         search_context = ""
         search_url = None
         if use_web_search:
             try:
-                concept_name = question.get('concept_name', '')
-                search_result = await self._search_web_for_concept(concept_name)
+                if search_task is None:
+                    search_task = self._search_web_for_concept(question.get('concept_name', ''))
+                search_result = await search_task
                 search_context = search_result.get('summary', '')
                 search_url = search_result.get('url')
             except Exception as e:
@@ -106,6 +361,38 @@ class SocraticHintGenerator:
 
         return hint_data
 
+    def _get_pregenerated_hint(
+        self,
+        question: Dict[str, Any],
+        selected_option: str,
+        hint_level: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build a hint from the question's distractor_hints, if it has one.
+
+        QuizGenerator asks for Socratic hints per wrong option and level when
+        the question is created, so most live hint requests are lookups.
+
+        Returns:
+            Hint dict in the _generate_hint_with_llm format, or None
+        """
+        for entry in question.get('distractor_hints') or []:
+            if entry.get('option_id') != selected_option:
+                continue
+
+            socratic_questions = entry.get(f'level_{hint_level}')
+            if not socratic_questions:
+                return None
+
+            return {
+                "wrong_answer_reasoning": entry.get('wrong_answer_reasoning', ''),
+                "socratic_questions": socratic_questions,
+                "guiding_questions": entry.get('guiding_questions', []),
+                "search_context_summary": ""
+            }
+
+        return None
+
     async def _generate_hint_with_llm(
         self,
         question: Dict,
@@ -118,28 +405,12 @@ class SocraticHintGenerator:
         """
         Use LLM to generate Socratic hint analyzing the wrong answer.
         """
-        # Define hint level characteristics
-        level_instructions = {
-            1: """Level 1 (Subtle): Question their assumptions gently. Don't reveal the answer.
-            - Ask why they might have thought this
-            - Point out contradictions in their logic
-            - Hint at what they should consider""",
-            2: """Level 2 (Moderate): Be more direct but still Socratic.
-            - Explain why their answer is incorrect
-            - Eliminate 1-2 obviously wrong options
-            - Guide them toward key concepts they missed""",
-            3: """Level 3 (Explicit): Almost reveal the answer through guidance.
-            - Clearly explain why their answer fails
-            - Point directly to the correct reasoning
-            - Leave only minimal discovery work for them"""
-        }
+        # Dynamic parts last: the document excerpt is shared by every hint for
+        # a quiz, so system instruction + excerpt form a reusable prompt prefix
+        prompt = f"""**Document Context** (use to ground explanations):
+{document_context[:HINT_DOCUMENT_EXCERPT_CHARS]}...
 
-        system_instruction = """You are a Socratic teaching expert who helps learners
-discover understanding through thoughtful questioning, not direct answers. Your goal is to
-help students realize why their answer is wrong and guide them to the correct answer through
-their own reasoning."""
-
-        prompt = f"""A student answered a quiz question incorrectly. Generate a Socratic dialogue
+A student answered a quiz question incorrectly. Generate a Socratic dialogue
 to help them discover why their answer is wrong and guide them to the right answer.
 
 **Question**: {question['question']}
@@ -150,56 +421,28 @@ to help them discover why their answer is wrong and guide them to the right answ
 **Student's Answer**: {selected_option_obj['id'].upper()}. {selected_option_obj['text']}
 **Correct Answer**: {correct_option_obj['text']} (don't reveal this directly unless Level 3)
 
-**Hint Level**: {hint_level}
-{level_instructions[hint_level]}
-
-**Document Context** (use to ground explanations):
-{document_context[:500]}...
-
 **Additional Context** (from web search):
 {search_context if search_context else "None available"}
 
-Generate a JSON response with:
-{{
-  "wrong_answer_reasoning": "Explain in 2-3 sentences why their selected answer is incorrect. Be clear and specific about what makes it wrong.",
-  "socratic_questions": [
-    "You selected '{selected_option_obj['text']}' - [Question that reveals assumption or contradiction]",
-    "[Question that hints at what they should consider]",
-    "[Question that guides toward correct reasoning]"
-  ],
-  "guiding_questions": [
-    "[What key concept or fact should they recall?]",
-    "[What relationship or connection are they missing?]"
-  ],
-  "search_context_summary": "Brief 1-2 sentence summary of web search findings (if available, otherwise empty string)"
-}}
-
-IMPORTANT:
-- Make socratic_questions specific to their wrong answer
-- Reference their selected option in at least the first question
-- For Level 1: Be subtle, question assumptions
-- For Level 2: Be clearer, narrow down options
-- For Level 3: Be explicit, almost point to answer
-- Keep all text concise and focused
+**Hint Level**: {hint_level}
+{HINT_LEVEL_INSTRUCTIONS[hint_level]}
 """
 
         try:
             result = await self.llm.generate(
                 prompt=prompt,
-                system_instruction=system_instruction,
+                system_instruction=HINT_SYSTEM_INSTRUCTION,
                 temperature=0.5,  # Moderate creativity
                 max_tokens=1024,
-                response_format="json"
+                response_format="json",
+                response_schema=LLMSocraticHint
             )
 
-            hint_data = json.loads(result)
+            return LLMSocraticHint.model_validate_json(result).model_dump()
 
-            # Validate structure
-            if not isinstance(hint_data, dict):
-                logger.error("hint_generation_invalid_format", type=type(hint_data).__name__)
-                return self._create_fallback_hint(question, hint_level)
-
-            return hint_data
+        except ValidationError as e:
+            logger.error("hint_generation_invalid_format", error=str(e))
+            return self._create_fallback_hint(question, hint_level)
 
         except Exception as e:
             logger.error("hint_generation_failed", error=str(e))
@@ -207,7 +450,11 @@ IMPORTANT:
 
     async def _search_web_for_concept(self, concept_name: str) -> Dict[str, str]:
         """
-        Search the web for concept explanation to enrich hints.
+        Search the web for concept explanation to enrich hints (cached).
+
+        Results are kept per normalized concept name, so cycling through hint
+        levels for one question searches once. Concurrent requests for the
+        same concept share one in-flight search. Failed searches are not kept.
 
         Args:
             concept_name: Name of the concept to search for
@@ -215,8 +462,33 @@ IMPORTANT:
         Returns:
             Dict with 'summary' and 'url' keys
         """
-        from app.services.llm import llm_service
-
+        key = concept_name.strip().lower()
+        task = self._get_concept_search_task(concept_name)
+
+        # Shield so one cancelled hint request doesn't cancel a shared search
+        result = await asyncio.shield(task)
+        if not result.get('summary') and self._concept_searches.get(key) is task:
+            del self._concept_searches[key]
+        return result
+
+    def _get_concept_search_task(self, concept_name: str) -> asyncio.Task:
+        """Cached search task for a concept, starting one on a miss."""
+        key = concept_name.strip().lower()
+
+        task = self._concept_searches.get(key)
+        if task is not None:
+            self._concept_searches.move_to_end(key)
+            logger.debug("concept_search_cache_hit", concept_name=concept_name)
+            return task
+
+        task = asyncio.create_task(self._run_concept_search(concept_name.strip()))
+        self._concept_searches[key] = task
+        if len(self._concept_searches) > MAX_CACHED_CONCEPT_SEARCHES:
+            self._concept_searches.popitem(last=False)
+        return task
+
+    async def _run_concept_search(self, concept_name: str) -> Dict[str, str]:
+        """Run one concept search (LLM-simulated WebSearch)."""
         # Note: WebSearch tool is available via the agent/tool system
         # For MVP, we'll use a simple prompt to the LLM to simulate search context
         # In production, integrate actual WebSearch tool
@@ -227,25 +499,29 @@ IMPORTANT:
 
             result = await self.llm.generate(
                 prompt=prompt,
-                system_instruction="You are a concise educational resource that explains concepts clearly.",
+                system_instruction=CONCEPT_SEARCH_SYSTEM_INSTRUCTION,
                 temperature=0.3,
                 max_tokens=200
             )
 
             return {
                 "summary": result.strip(),
-                "url": f"https://www.google.com/search?q={concept_name.replace(' ', '+')}"
+                "url": self._search_url(concept_name)
             }
         except Exception as e:
             logger.warning("web_search_simulation_failed", error=str(e))
             return {"summary": "", "url": None}
 
+    def _search_url(self, concept_name: str) -> str:
+        """Web search link for a concept."""
+        return f"https://www.google.com/search?q={concept_name.replace(' ', '+')}"
+
     def _format_options(self, options: List[Dict]) -> str:
         """Format options for display in prompt."""
-        return "\n".join([
+        return "\n".join(
             f"{opt['id'].upper()}. {opt['text']}"
             for opt in options
-        ])
+        )
 
     def _create_fallback_hint(self, question: Dict, hint_level: int) -> Dict[str, Any]:
         """
@@ -8,6 +8,7 @@ Detects struggle based on:
 """
 
 import time
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -24,6 +25,21 @@ class StruggleLevel(str):
     SIGNIFICANT = "significant"  # 3+ wrong attempts (trigger Interactive Learning)
 
 
+# Struggle level indexed by wrong attempt count (3+ is SIGNIFICANT)
+_LEVEL_BY_WRONG_COUNT = (
+    StruggleLevel.NONE,
+    StruggleLevel.MINOR,
+    StruggleLevel.MODERATE,
+)
+
+# Recommendation per struggle level when learning mode isn't triggered
+_RECOMMENDATION_BY_LEVEL = {
+    StruggleLevel.NONE: "No intervention needed - user is progressing well",
+    StruggleLevel.MINOR: "Provide Level 1 hint (gentle nudge)",
+    StruggleLevel.MODERATE: "Provide Level 2 hint to guide thinking",
+}
+
+
 class StruggleDetector:
     """
     Detects when learners are struggling and need Interactive Learning Mode.
@@ -49,16 +65,17 @@ class StruggleDetector:
         Returns:
             Dict with struggle_level, should_trigger_learning_mode, and analysis
         """
-        wrong_attempts = [a for a in attempts if not a.get('is_correct', False)]
-        wrong_count = len(wrong_attempts)
+        # Single pass: wrong count and selected options together
+        wrong_count = 0
+        selected_options = []
+        for attempt in attempts:
+            selected_options.append(attempt.get('selected_option'))
+            if not attempt.get('is_correct', False):
+                wrong_count += 1
 
         # Determine struggle level
-        if wrong_count == 0:
-            struggle_level = StruggleLevel.NONE
-        elif wrong_count == 1:
-            struggle_level = StruggleLevel.MINOR
-        elif wrong_count == 2:
-            struggle_level = StruggleLevel.MODERATE
+        if wrong_count < len(_LEVEL_BY_WRONG_COUNT):
+            struggle_level = _LEVEL_BY_WRONG_COUNT[wrong_count]
         else:
             struggle_level = StruggleLevel.SIGNIFICANT
 
@@ -67,7 +84,7 @@ class StruggleDetector:
 
         # Analyze pattern
         pattern_analysis = self._analyze_answer_pattern(
-            attempts,
+            selected_options,
             question.get('options', [])
         )
 
@@ -104,29 +121,29 @@ class StruggleDetector:
 
     def _analyze_answer_pattern(
         self,
-        attempts: List[Dict[str, Any]],
+        selected_options: List[Optional[str]],
         options: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """
         Analyze pattern of selected answers to understand misconception.
 
         Args:
-            attempts: List of attempts
+            selected_options: Option ID selected in each attempt, in order
             options: Available answer options
 
         Returns:
             Dict with pattern_type and insights
         """
-        if len(attempts) < 2:
+        if len(selected_options) < 2:
             return {
                 "pattern_type": "insufficient_data",
                 "insight": "Not enough attempts to detect pattern"
             }
 
-        selected_options = [a.get('selected_option') for a in attempts]
+        option_frequencies = Counter(selected_options)
 
         # Check if repeating same wrong answer (consistent misconception)
-        if len(set(selected_options)) == 1:
+        if len(option_frequencies) == 1:
             return {
                 "pattern_type": "consistent_misconception",
                 "insight": "User consistently selects same answer - likely has specific misconception",
@@ -134,7 +151,7 @@ class StruggleDetector:
             }
 
         # Check if trying different options each time (random guessing)
-        if len(set(selected_options)) == len(selected_options):
+        if len(option_frequencies) == len(selected_options):
             return {
                 "pattern_type": "random_guessing",
                 "insight": "User tries different option each time - may not understand concept"
@@ -144,7 +161,7 @@ class StruggleDetector:
         return {
             "pattern_type": "mixed",
             "insight": "User has tried multiple different answers",
-            "option_frequencies": {opt: selected_options.count(opt) for opt in set(selected_options)}
+            "option_frequencies": dict(option_frequencies)
         }
 
     def _analyze_time_spent(
@@ -202,19 +219,13 @@ class StruggleDetector:
         if should_trigger:
             return "Trigger Interactive Learning Mode to build understanding through Socratic questioning"
 
-        if struggle_level == StruggleLevel.NONE:
-            return "No intervention needed - user is progressing well"
-
-        if struggle_level == StruggleLevel.MINOR:
-            return "Provide Level 1 hint (gentle nudge)"
-
-        if struggle_level == StruggleLevel.MODERATE:
-            if pattern_analysis['pattern_type'] == 'consistent_misconception':
-                return "Provide Level 2 hint addressing specific misconception"
-            else:
-                return "Provide Level 2 hint to guide thinking"
+        if (
+            struggle_level == StruggleLevel.MODERATE
+            and pattern_analysis['pattern_type'] == 'consistent_misconception'
+        ):
+            return "Provide Level 2 hint addressing specific misconception"
 
-        return "Continue monitoring"
+        return _RECOMMENDATION_BY_LEVEL.get(struggle_level, "Continue monitoring")
 
 
 # Global instance
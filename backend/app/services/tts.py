@@ -3,14 +3,24 @@ Text-to-Speech service using gTTS for Phase 0.
 Will upgrade to Chatterbox in Phase 1.
 """
 
-import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from typing import List, Dict
 from pathlib import Path
 
 from gtts import gTTS
 from pydub import AudioSegment
+from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.services.audio_decoder import (
+    DECODE_CHANNELS,
+    DECODE_SAMPLE_RATE,
+    DECODE_SAMPLE_WIDTH,
+    decode_mp3,
+    export_mp3,
+)
+from app.services.audio_stitch import conform_segment, join_segments
+from app.services.tts_cache import tts_cache
 
 logger = get_logger(__name__)
 
@@ -28,6 +38,12 @@ class TTSService:
         self.brainy_slow = True      # Slower, more measured
         self.snarky_slow = False     # Faster, more energetic
 
+        # Every turn is converted to this format once, on arrival (gTTS's
+        # decoded format, so only cache hits need converting)
+        self.frame_rate = DECODE_SAMPLE_RATE
+        self.channels = DECODE_CHANNELS
+        self.sample_width = DECODE_SAMPLE_WIDTH
+
         logger.info("tts_service_initialized", provider="gTTS")
 
     def generate_audio_segment(
@@ -53,28 +69,35 @@ class TTSService:
             lang = self.snarky_lang
             slow = self.snarky_slow
 
-        logger.info(
-            "generating_audio_segment",
-            speaker=speaker,
-            text_length=len(text),
-            lang=lang,
+        cache_key = tts_cache.make_key("gtts", speaker, text, voice=f"{lang}|slow={slow}")
+        audio = tts_cache.get_or_compute(
+            cache_key,
+            lambda: self._synthesize(text, lang, slow)
         )
+        return conform_segment(audio, self.frame_rate, self.channels, self.sample_width)
 
-        # Generate TTS
+    def _synthesize(self, text: str, lang: str, slow: bool) -> AudioSegment:
+        """Run gTTS for one turn."""
         tts = gTTS(text=text, lang=lang, slow=slow)
 
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-            temp_path = tmp_file.name
-            tts.save(temp_path)
-
-        # Load as AudioSegment
-        audio = AudioSegment.from_mp3(temp_path)
+        # Write MP3 to memory and decode
+        mp3_buffer = BytesIO()
+        tts.write_to_fp(mp3_buffer)
+        return decode_mp3(mp3_buffer.getvalue())
 
-        # Clean up temp file
-        os.unlink(temp_path)
+    def _generate_turn(self, turn_number: int, turn: Dict) -> AudioSegment:
+        """Generate audio for one script turn (runs on the episode thread pool)."""
+        audio_segment = self.generate_audio_segment(turn['text'], turn['speaker'])
 
-        return audio
+        # One record per turn, after synthesis
+        logger.info(
+            "generated_turn",
+            turn_number=turn_number,
+            speaker=turn['speaker'],
+            text_length=len(turn['text']),
+            duration_ms=len(audio_segment),
+        )
+        return audio_segment
 
     def generate_episode_audio(
         self,
@@ -99,40 +122,34 @@ class TTSService:
             output_path=output_path,
         )
 
-        # Combine all audio segments
-        full_audio = AudioSegment.empty()
-        silence = AudioSegment.silent(duration=silence_between_turns)
-
-        for i, turn in enumerate(script, 1):
-            speaker = turn['speaker']
-            text = turn['text']
-
-            logger.info(
-                "processing_turn",
-                turn_number=i,
-                speaker=speaker,
-            )
-
-            # Generate audio for this turn
-            audio_segment = self.generate_audio_segment(text, speaker)
-
-            # Add to full audio
-            full_audio += audio_segment
-
-            # Add silence between turns (except after last turn)
-            if i < len(script):
-                full_audio += silence
+        # Repeated (speaker, text) turns are synthesized once; concurrent
+        # duplicates would otherwise all miss the TTS cache together
+        unique_turns = {}
+        for turn_number, turn in enumerate(script, 1):
+            unique_turns.setdefault((turn['speaker'], turn['text']), (turn_number, turn))
+
+        # Turns are independent network calls: run them on a thread pool (the
+        # GIL is released while waiting on Google), then join them once in
+        # script order
+        with ThreadPoolExecutor(max_workers=settings.tts_max_workers) as executor:
+            audio_by_turn = dict(zip(unique_turns, executor.map(
+                lambda item: self._generate_turn(*item),
+                unique_turns.values(),
+            )))
+        segments = [audio_by_turn[(turn['speaker'], turn['text'])] for turn in script]
+
+        # Silence between turns (not after the last one)
+        full_audio = join_segments(segments, silence_between_turns)
 
         # Ensure output directory exists
-        output_dir = os.path.dirname(output_path)
-        os.makedirs(output_dir, exist_ok=True)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Export final audio
-        full_audio.export(output_path, format='mp3')
+        file_size_bytes = export_mp3(full_audio, output_path)
 
         # Calculate metadata
         duration_seconds = len(full_audio) / 1000.0
-        file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
+        file_size_mb = file_size_bytes / (1024 * 1024)
 
         metadata = {
             'duration_seconds': duration_seconds,
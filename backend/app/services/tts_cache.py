@@ -0,0 +1,242 @@
+"""
+Content-addressed cache for synthesized TTS turns.
+
+Short interjections ("Right.", "Exactly.") and catchphrases repeat verbatim
+within and across episodes, and regenerating a script re-synthesizes
+unchanged turns; each repeat would otherwise pay a full TTS inference.
+Entries are keyed by provider, speaker, voice settings and text, so
+changing a voice invalidates its entries.
+
+Audio is encoded once when stored - mono 16 kHz Opus by default - and
+only the compressed bytes are kept:
+- Memory: bounded LRU of encoded entries (~60x smaller than PCM)
+- Disk: PROJECT_ROOT/cache/tts/<key[:2]>/<key>.<ext> so reuse survives
+  restarts, capped at settings.tts_cache_max_bytes (least recently used
+  files are evicted first)
+Entries are decoded back to AudioSegments only on a cache hit.
+
+Sync services (gTTS, Maya1) use the blocking methods; async services use
+get/put, which run them in a worker thread.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from pydub import AudioSegment
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.services.audio_decoder import (
+    CACHE_EXTENSION_FORMATS,
+    decode_cache_entry,
+    encode_cache_entry,
+)
+
+logger = get_logger(__name__)
+
+# Get project root (Podcastify directory)
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+TTS_CACHE_DIR = PROJECT_ROOT / "cache" / "tts"
+
+MEMORY_CACHE_MAX_ENTRIES = 2048  # ~10 KB per encoded turn
+DISK_EVICTION_TARGET_RATIO = 0.9  # Evict down to 90% of the cap, not just under it
+
+
+class TTSCache:
+    """
+    Memory + disk cache of encoded turn audio.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = TTS_CACHE_DIR,
+        max_memory_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        max_disk_bytes: int = settings.tts_cache_max_bytes,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        # key -> (encoded bytes, file extension)
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        # Total size of cached files (scanned on first write)
+        self._disk_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, speaker: str, text: str, voice: str = "") -> str:
+        """
+        Build the cache key for one turn.
+
+        Args:
+            provider: TTS provider name
+            speaker: "Brainy" or "Snarky"
+            text: Exact text sent to the provider
+            voice: Provider voice settings (description, language, ...)
+
+        Returns:
+            Hex sha256 digest
+        """
+        return hashlib.sha256(f"{provider}|{speaker}|{voice}|{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, extension: str) -> Path:
+        """Sharded on-disk location of an entry."""
+        return self.cache_dir / key[:2] / f"{key}.{extension}"
+
+    def _remember(self, key: str, entry: Tuple[bytes, str]):
+        """Add to the memory LRU, evicting the oldest entry past the cap."""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """Read an on-disk entry, whatever codec it was stored in."""
+        for extension in CACHE_EXTENSION_FORMATS:
+            path = self._path(key, extension)
+            if path.exists():
+                data = path.read_bytes()
+                # Bump mtime: eviction removes least recently used files first
+                os.utime(path)
+                return data, extension
+        return None
+
+    def _write_disk(self, key: str, entry: Tuple[bytes, str]):
+        """Store an encoded entry atomically, then enforce the size cap."""
+        data, extension = entry
+        path = self._path(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f".{extension}.tmp")
+        tmp_path.write_bytes(data)
+        # An overwritten entry's old size no longer counts toward the cap
+        try:
+            replaced_bytes = path.stat().st_size
+        except FileNotFoundError:
+            replaced_bytes = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+            else:
+                self._disk_bytes += len(data) - replaced_bytes
+            over_cap = self._disk_bytes > self.max_disk_bytes
+
+        if over_cap:
+            self._evict()
+
+    def _scan_disk(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every cached file."""
+        files = []
+        for extension in CACHE_EXTENSION_FORMATS:
+            for path in self.cache_dir.glob(f"*/*.{extension}"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict(self):
+        """Delete least recently used files until under the target size."""
+        files = sorted(self._scan_disk())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * DISK_EVICTION_TARGET_RATIO
+
+        evicted = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._disk_bytes = total
+            self.stats["evictions"] += evicted
+
+        logger.info("tts_cache_evicted", files=evicted, disk_bytes=total)
+
+    def get_blocking(self, key: str) -> Optional[AudioSegment]:
+        """Look up a turn's audio in memory, then on disk (blocking)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+
+        if entry is None:
+            try:
+                entry = self._read_disk(key)
+            except Exception as e:
+                logger.warning("tts_cache_read_failed", key=key, error=str(e))
+
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["disk_hits"] += 1
+            self._remember(key, entry)
+
+        try:
+            return decode_cache_entry(*entry)
+        except Exception as e:
+            logger.warning("tts_cache_decode_failed", key=key, error=str(e))
+            with self._lock:
+                self._memory.pop(key, None)
+            return None
+
+    def put_blocking(self, key: str, audio: AudioSegment):
+        """Encode a turn's audio once and store it in memory and on disk (blocking)."""
+        try:
+            entry = encode_cache_entry(audio)
+        except Exception as e:
+            logger.warning("tts_cache_encode_failed", key=key, error=str(e))
+            return
+
+        self._remember(key, entry)
+
+        try:
+            self._write_disk(key, entry)
+        except Exception as e:
+            logger.warning("tts_cache_write_failed", key=key, error=str(e))
+
+    def get_or_compute(self, key: str, compute: Callable[[], AudioSegment]) -> AudioSegment:
+        """
+        Return cached audio for key, or synthesize it with compute and cache it.
+
+        Args:
+            key: Key from make_key
+            compute: Blocking synthesis call for a miss
+
+        Returns:
+            Turn audio
+        """
+        audio = self.get_blocking(key)
+        if audio is None:
+            audio = compute()
+            self.put_blocking(key, audio)
+        return audio
+
+    async def get(self, key: str) -> Optional[AudioSegment]:
+        """Look up a turn's audio in memory, then on disk."""
+        return await asyncio.to_thread(self.get_blocking, key)
+
+    async def put(self, key: str, audio: AudioSegment):
+        """Encode a turn's audio once and store it in memory and on disk."""
+        await asyncio.to_thread(self.put_blocking, key, audio)
+
+
+# Global cache instance
+tts_cache = TTSCache()
@@ -3,20 +3,32 @@ Enhanced TTS service using Maya1 for high-quality voices.
 Includes fallback to gTTS if Maya1 unavailable.
 """
 
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from typing import List, Dict, Optional
 from pathlib import Path
 
 from pydub import AudioSegment
 
+from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.services.audio_decoder import (
+    DECODE_CHANNELS,
+    DECODE_SAMPLE_RATE,
+    DECODE_SAMPLE_WIDTH,
+    decode_mp3,
+    export_mp3,
+)
+from app.services.audio_stitch import conform_segment, join_segments
+from app.services.tts_cache import tts_cache
 from app.models.voice_profiles import (
     get_voice_profile,
     add_emotion_tags,
     BRAINY_PROFILE,
     SNARKY_PROFILE
 )
-from app.services.maya1_client_v2 import maya1_client_v2 as maya1_client
+from app.services.maya1_client_v2 import get_maya1_client_v2
 
 # Fallback to gTTS
 try:
@@ -27,6 +39,10 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# The public Maya1 Space queues requests per user; more than a couple in
+# flight just wait in its queue (or trip its rate limit)
+MAYA1_MAX_CONCURRENT_REQUESTS = 2
+
 
 class Maya1TTSService:
     """
@@ -43,6 +59,15 @@ class Maya1TTSService:
         else:
             logger.info("tts_service_initialized", provider="gTTS_fallback")
 
+        # Caps in-flight Maya1 requests across episode worker threads
+        self._maya1_semaphore = threading.BoundedSemaphore(MAYA1_MAX_CONCURRENT_REQUESTS)
+
+        # Every turn (Maya1, gTTS fallback or cache hit) is converted to this
+        # format once, on arrival, so stitching never resamples
+        self.frame_rate = DECODE_SAMPLE_RATE
+        self.channels = DECODE_CHANNELS
+        self.sample_width = DECODE_SAMPLE_WIDTH
+
         # gTTS fallback settings
         self.gtts_brainy_lang = 'en-uk'
         self.gtts_snarky_lang = 'en-us'
@@ -50,7 +75,7 @@ class Maya1TTSService:
     def _test_maya1_availability(self) -> bool:
         """Test if Maya1 is available."""
         try:
-            return maya1_client.test_connection()
+            return get_maya1_client_v2().test_connection()
         except Exception as e:
             logger.warning("maya1_unavailable", error=str(e))
             return False
@@ -72,17 +97,12 @@ class Maya1TTSService:
         Returns:
             AudioSegment object
         """
-        logger.info(
-            "generating_audio_segment",
-            speaker=speaker,
-            text_length=len(text),
-            provider="Maya1" if self.use_maya1 else "gTTS"
-        )
-
         if self.use_maya1:
-            return self._generate_maya1(text, speaker, add_emotions)
+            audio = self._generate_maya1(text, speaker, add_emotions)
         else:
-            return self._generate_gtts_fallback(text, speaker)
+            audio = self._generate_gtts_fallback(text, speaker)
+
+        return conform_segment(audio, self.frame_rate, self.channels, self.sample_width)
 
     def _generate_maya1(
         self,
@@ -100,16 +120,11 @@ class Maya1TTSService:
             if add_emotions:
                 enhanced_text = add_emotion_tags(text, speaker)
 
-            # Generate with Maya1
-            audio = maya1_client.generate_audio(
-                text=enhanced_text,
-                voice_description=profile.description
-            )
-
-            logger.info(
-                "maya1_audio_generated",
-                speaker=speaker,
-                duration_ms=len(audio)
+            # Generate with Maya1 (failures aren't cached - they fall back below)
+            cache_key = tts_cache.make_key("maya1", speaker, enhanced_text, voice=profile.description)
+            audio = tts_cache.get_or_compute(
+                cache_key,
+                lambda: self._synthesize_maya1(enhanced_text, profile.description)
             )
 
             return audio
@@ -125,6 +140,14 @@ class Maya1TTSService:
             logger.info("falling_back_to_gtts")
             return self._generate_gtts_fallback(text, speaker)
 
+    def _synthesize_maya1(self, text: str, voice_description: str) -> AudioSegment:
+        """Run Maya1 for one turn, within the Space's concurrency limit."""
+        with self._maya1_semaphore:
+            return get_maya1_client_v2().generate_audio(
+                text=text,
+                voice_description=voice_description
+            )
+
     def _generate_gtts_fallback(
         self,
         text: str,
@@ -138,22 +161,39 @@ class Maya1TTSService:
         lang = self.gtts_brainy_lang if speaker == "Brainy" else self.gtts_snarky_lang
         slow = (speaker == "Brainy")
 
-        # Generate TTS
-        tts = gTTS(text=text, lang=lang, slow=slow)
-
-        # Save to temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-            temp_path = tmp_file.name
-            tts.save(temp_path)
+        # Same key as TTSService, so both share gTTS entries
+        cache_key = tts_cache.make_key("gtts", speaker, text, voice=f"{lang}|slow={slow}")
+        return tts_cache.get_or_compute(
+            cache_key,
+            lambda: self._synthesize_gtts(text, lang, slow)
+        )
 
-        # Load as AudioSegment
-        audio = AudioSegment.from_mp3(temp_path)
+    def _synthesize_gtts(self, text: str, lang: str, slow: bool) -> AudioSegment:
+        """Run gTTS for one turn."""
+        tts = gTTS(text=text, lang=lang, slow=slow)
 
-        # Clean up
-        os.unlink(temp_path)
+        # Write MP3 to memory and decode
+        mp3_buffer = BytesIO()
+        tts.write_to_fp(mp3_buffer)
+        return decode_mp3(mp3_buffer.getvalue())
+
+    def _generate_turn(self, turn_number: int, turn: Dict, use_emotions: bool) -> AudioSegment:
+        """Generate audio for one script turn (runs on the episode thread pool)."""
+        audio_segment = self.generate_audio_segment(
+            text=turn['text'],
+            speaker=turn['speaker'],
+            add_emotions=use_emotions
+        )
 
-        return audio
+        # One record per turn, after synthesis (Maya1 failures log their own error)
+        logger.info(
+            "generated_turn",
+            turn_number=turn_number,
+            speaker=turn['speaker'],
+            text_length=len(turn['text']),
+            duration_ms=len(audio_segment),
+        )
+        return audio_segment
 
     def generate_episode_audio(
         self,
@@ -181,44 +221,34 @@ class Maya1TTSService:
             provider="Maya1" if self.use_maya1 else "gTTS"
         )
 
-        # Combine all audio segments
-        full_audio = AudioSegment.empty()
-        silence = AudioSegment.silent(duration=silence_between_turns)
-
-        for i, turn in enumerate(script, 1):
-            speaker = turn['speaker']
-            text = turn['text']
-
-            logger.info(
-                "processing_turn",
-                turn_number=i,
-                speaker=speaker,
-            )
-
-            # Generate audio for this turn
-            audio_segment = self.generate_audio_segment(
-                text=text,
-                speaker=speaker,
-                add_emotions=use_emotions
-            )
-
-            # Add to full audio
-            full_audio += audio_segment
-
-            # Add silence between turns (except after last turn)
-            if i < len(script):
-                full_audio += silence
+        # Repeated (speaker, text) turns are synthesized once; concurrent
+        # duplicates would otherwise all miss the TTS cache together
+        unique_turns = {}
+        for turn_number, turn in enumerate(script, 1):
+            unique_turns.setdefault((turn['speaker'], turn['text']), (turn_number, turn))
+
+        # Turns are independent network calls: run them on a thread pool (Maya1
+        # requests are further capped by _maya1_semaphore), then join them
+        # once in script order
+        with ThreadPoolExecutor(max_workers=settings.tts_max_workers) as executor:
+            audio_by_turn = dict(zip(unique_turns, executor.map(
+                lambda item: self._generate_turn(*item, use_emotions),
+                unique_turns.values(),
+            )))
+        segments = [audio_by_turn[(turn['speaker'], turn['text'])] for turn in script]
+
+        # Silence between turns (not after the last one)
+        full_audio = join_segments(segments, silence_between_turns)
 
         # Ensure output directory exists
-        output_dir = os.path.dirname(output_path)
-        os.makedirs(output_dir, exist_ok=True)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Export final audio
-        full_audio.export(output_path, format='mp3')
+        file_size_bytes = export_mp3(full_audio, output_path)
 
         # Calculate metadata
         duration_seconds = len(full_audio) / 1000.0
-        file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
+        file_size_mb = file_size_bytes / (1024 * 1024)
 
         metadata = {
             'duration_seconds': duration_seconds,
@@ -238,5 +268,15 @@ class Maya1TTSService:
         return metadata
 
 
-# Global service instance
-maya1_tts_service = Maya1TTSService(use_maya1=True)
+# Global service instance (created on first use, not at import)
+_maya1_tts_service: Optional[Maya1TTSService] = None
+_maya1_tts_service_lock = threading.Lock()
+
+
+def get_maya1_tts_service() -> Maya1TTSService:
+    """Get or initialize the global Maya1 TTS service."""
+    global _maya1_tts_service
+    with _maya1_tts_service_lock:
+        if _maya1_tts_service is None:
+            _maya1_tts_service = Maya1TTSService(use_maya1=True)
+    return _maya1_tts_service
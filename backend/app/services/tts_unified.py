@@ -12,19 +12,35 @@ Features:
 - Simple, fast, reliable
 """
 
-import os
 import asyncio
-from typing import List, Dict
+import logging
+import threading
+import time
+from typing import Callable, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from pydub import AudioSegment
 
 from app.core.logging_config import get_logger
 from app.models.voice_profiles import get_voice_profile
-from app.services.parler_client import ParlerClient
+from app.services.audio_decoder import Mp3StreamEncoder
+from app.services.parler_client import ParlerClient, ParlerBatchUnsupported
+from app.services.tts_cache import tts_cache
 
 logger = get_logger(__name__)
 
+# Turns are binned by word count so a request only holds similar-length
+# turns: short turns aren't queued behind long ones, and batches pad less
+TURN_LENGTH_BINS = (
+    ("short", 20),
+    ("medium", 35),
+    ("long", None),
+)
+# Parler requests in flight per bin, across all callers (avoids overloading the server)
+PARLER_MAX_CONCURRENT_REQUESTS_PER_BIN = 1
+# A successful health probe is trusted this long before probing again
+PARLER_HEALTH_CHECK_TTL_SECONDS = 60
+
 
 class UnifiedTTSService:
     """
@@ -34,14 +50,50 @@ class UnifiedTTSService:
     def __init__(self):
         # Initialize only Parler client
         self.parler_client = ParlerClient()
-        self.parler_available = self.parler_client.test_connection()
+        # Probed lazily on first use (see _ensure_available), not at startup
+        self.parler_available = False
+        self._parler_checked_at: Optional[float] = None
+        self._parler_check_lock = asyncio.Lock()
+        self.cache = tts_cache
+        # Assume batch support until the server says otherwise
+        self.parler_batch_supported = True
+        # Shared so per-section synthesis calls don't multiply concurrency
+        self._bin_semaphores = {
+            name: asyncio.Semaphore(PARLER_MAX_CONCURRENT_REQUESTS_PER_BIN)
+            for name, _ in TURN_LENGTH_BINS
+        }
 
         logger.info(
             "tts_service_initialized",
-            parler_available=self.parler_available,
             provider="parler_only"
         )
 
+    async def _ensure_available(self):
+        """
+        Make sure the Parler server is reachable, probing at most once per TTL.
+
+        Concurrent callers share one probe. A failed probe isn't remembered,
+        so the next request retries (e.g. once the Colab notebook is up).
+
+        Raises:
+            Exception: If Parler TTS is unavailable
+        """
+        async with self._parler_check_lock:
+            fresh = (
+                self._parler_checked_at is not None
+                and time.monotonic() - self._parler_checked_at < PARLER_HEALTH_CHECK_TTL_SECONDS
+            )
+            if not (self.parler_available and fresh):
+                self.parler_available = await self.parler_client.test_connection()
+                self._parler_checked_at = time.monotonic()
+
+        if not self.parler_available:
+            raise Exception(
+                "Parler TTS is not available. "
+                "Please check that your Colab notebook is running and "
+                f"the ngrok URL is correct in .env: PARLER_URL"
+            )
+
     async def generate_episode_audio(
         self,
         script: List[Dict],
@@ -70,166 +122,475 @@ class UnifiedTTSService:
             output_path=output_path
         )
 
-        # Check Parler availability
-        if not self.parler_available:
-            raise Exception(
-                "Parler TTS is not available. "
-                "Please check that your Colab notebook is running and "
-                f"the ngrok URL is correct in .env: PARLER_URL"
-            )
+        episode_audio = await self.start_episode_audio(
+            output_path, silence_between_turns, use_emotions
+        )
+        episode_audio.add_section(0, script)
+        return await episode_audio.finish()
+
+    async def start_episode_audio(
+        self,
+        output_path: str,
+        silence_between_turns: int = 400,
+        use_emotions: bool = True,
+    ) -> "EpisodeAudioStream":
+        """
+        Start an episode whose sections are added as they are written.
+
+        Args:
+            output_path: Where to save final audio
+            silence_between_turns: Pause between speakers (ms)
+            use_emotions: Enable automatic emotion tags (unused for Parler)
+
+        Returns:
+            EpisodeAudioStream to add sections to, then finish
+
+        Raises:
+            Exception: If Parler TTS is unavailable
+        """
+        await self._ensure_available()
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        return EpisodeAudioStream(self, output_path, silence_between_turns, use_emotions)
+
+    async def synthesize_turns(
+        self,
+        turns: List[Dict],
+        on_ready: Optional[Callable[[int, AudioSegment], None]] = None,
+        in_flight: Optional[Dict[str, asyncio.Future]] = None,
+    ) -> List[AudioSegment]:
+        """
+        Generate audio for dialogue turns using Parler TTS.
+
+        Safe to call concurrently (e.g. once per script section as each one
+        is written) - all calls share one Parler request limit. Repeated
+        (speaker, text) turns are synthesized once, and previously generated
+        turns come from the TTS cache.
+
+        Args:
+            turns: List of dialogue turns
+            on_ready: Called with (turn index, audio) as each turn's audio
+                becomes available, in completion order
+            in_flight: Cache key -> future of its audio, shared by the calls
+                for one episode, so a turn repeated across calls (e.g. "Right."
+                in two sections) waits for the first call's synthesis
+
+        Returns:
+            One AudioSegment per turn, in order
+        """
+        await self._ensure_available()
+
+        keys = [
+            self.cache.make_key("parler", turn.get("speaker", "Brainy"), turn.get("text", ""))
+            for turn in turns
+        ]
+
+        indices_by_key: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            indices_by_key.setdefault(key, []).append(i)
+
+        # Turns another call is already producing are awaited, not synthesized
+        if in_flight is None:
+            in_flight = {}
+        shared = [key for key in indices_by_key if key in in_flight]
+        owned = [key for key in indices_by_key if key not in in_flight]
+        loop = asyncio.get_running_loop()
+        for key in owned:
+            in_flight[key] = loop.create_future()
+
+        audio_by_key = {}
+
+        def resolve(key: str, audio_segment: AudioSegment):
+            audio_by_key[key] = audio_segment
+            if not in_flight[key].done():
+                in_flight[key].set_result(audio_segment)
+            if on_ready is not None:
+                for i in indices_by_key[key]:
+                    on_ready(i, audio_segment)
+
+        async def wait_for_shared(key: str):
+            resolve(key, await asyncio.shield(in_flight[key]))
+
+        async def produce_owned() -> Tuple[int, int]:
+            for key in owned:
+                cached = await self.cache.get(key)
+                if cached is not None:
+                    resolve(key, cached)
+
+            # First occurrence of each turn that still needs synthesis
+            pending = {}
+            for key, turn in zip(keys, turns):
+                if key in owned and key not in audio_by_key and key not in pending:
+                    pending[key] = turn
+
+            if pending:
+                pending_keys = list(pending)
+                await self._synthesize_with_parler(
+                    list(pending.values()),
+                    on_ready=lambda j, audio_segment: resolve(pending_keys[j], audio_segment)
+                )
+                await asyncio.gather(*[
+                    self.cache.put(key, audio_by_key[key]) for key in pending
+                ])
+
+            return len(owned) - len(pending), len(pending)
 
         try:
-            # Generate audio with Parler (parallel processing for 3x speedup)
-            full_audio, turn_timings = await self._generate_with_parler_parallel(
-                script=script,
-                silence_between_turns=silence_between_turns
+            results = await asyncio.gather(
+                produce_owned(),
+                *[wait_for_shared(key) for key in shared]
             )
+            cached_count, synthesized_count = results[0]
+        except BaseException as e:
+            # Calls waiting on these turns fail with us instead of hanging
+            for key in owned:
+                if not in_flight[key].done():
+                    if isinstance(e, Exception):
+                        in_flight[key].set_exception(e)
+                    else:
+                        in_flight[key].cancel()
+            raise
 
-            # Save audio
-            output_dir = os.path.dirname(output_path)
-            os.makedirs(output_dir, exist_ok=True)
-            full_audio.export(output_path, format='mp3')
-
-            # Calculate metadata
-            duration_seconds = len(full_audio) / 1000.0
-            file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
-
-            metadata = {
-                'duration_seconds': duration_seconds,
-                'duration_minutes': duration_seconds / 60,
-                'file_size_mb': round(file_size_mb, 2),
-                'total_turns': len(script),
-                'output_path': output_path,
-                'tts_provider_used': 'parler',
-                'tts_providers_available': {
-                    'parler': self.parler_available,
-                },
-                'emotions_enabled': use_emotions,
-                'voice_consistency': 'guaranteed',
-                'turn_timings': turn_timings,
-            }
-
-            logger.info(
-                "episode_audio_generated_successfully",
-                provider="parler",
-                duration_seconds=duration_seconds,
-                turn_count=len(script),
-                file_size_mb=metadata['file_size_mb']
-            )
+        logger.info(
+            "tts_turns_resolved",
+            turn_count=len(turns),
+            unique_turns=len(audio_by_key),
+            cached=cached_count,
+            synthesized=synthesized_count,
+            shared=len(shared)
+        )
 
-            return metadata
+        return [audio_by_key[key] for key in keys]
 
-        except Exception as e:
-            logger.error(
-                "parler_generation_failed",
-                error=str(e),
-                turns_attempted=len(script)
-            )
-            raise Exception(f"Parler TTS generation failed: {str(e)}")
+    @staticmethod
+    def _length_bin(turn: Dict) -> str:
+        """Name of the TURN_LENGTH_BINS bin for a turn's word count."""
+        word_count = len(turn.get("text", "").split())
+        for name, max_words in TURN_LENGTH_BINS:
+            if max_words is None or word_count <= max_words:
+                return name
 
-    async def _generate_with_parler_parallel(
+    async def _synthesize_with_parler(
         self,
-        script: List[Dict],
-        silence_between_turns: int,
-        max_concurrent: int = 2  # Reduced from 4 to avoid overloading Parler server
-    ) -> tuple[AudioSegment, List[Dict]]:
+        turns: List[Dict],
+        on_ready: Optional[Callable[[int, AudioSegment], None]] = None,
+    ) -> List[AudioSegment]:
         """
-        Generate audio for all turns using Parler TTS with parallel processing.
+        Generate audio for turns with Parler, dispatching each length bin separately.
 
         Args:
-            script: List of dialogue turns
-            silence_between_turns: Pause duration (ms)
-            max_concurrent: Maximum concurrent TTS requests (default: 4)
+            turns: List of dialogue turns
+            on_ready: Called with (turn index, audio) as each turn completes
 
         Returns:
-            Tuple of (full_audio, turn_timings)
+            One AudioSegment per turn, in order
         """
-        silence = AudioSegment.silent(duration=silence_between_turns)
+        bins: Dict[str, List[int]] = {}
+        for i, turn in enumerate(turns):
+            bins.setdefault(self._length_bin(turn), []).append(i)
 
         logger.info(
             "starting_parler_generation_parallel",
-            turn_count=len(script),
-            silence_ms=silence_between_turns,
-            max_concurrent=max_concurrent
+            turn_count=len(turns),
+            bin_sizes={name: len(indices) for name, indices in bins.items()}
         )
 
-        # Generate all turns in parallel with async wrapper
-        async def generate_turn(i: int, turn: Dict):
-            """Generate a single turn asynchronously."""
+        segments: List[Optional[AudioSegment]] = [None] * len(turns)
+
+        async def run_bin(name: str, indices: List[int]):
+            def store(j: int, audio_segment: AudioSegment):
+                segments[indices[j]] = audio_segment
+                if on_ready is not None:
+                    on_ready(indices[j], audio_segment)
+
+            await self._synthesize_bin(name, [turns[i] for i in indices], on_ready=store)
+
+        await asyncio.gather(*[run_bin(name, indices) for name, indices in bins.items()])
+        return segments
+
+    async def _synthesize_bin(
+        self,
+        bin_name: str,
+        turns: List[Dict],
+        on_ready: Optional[Callable[[int, AudioSegment], None]] = None,
+    ) -> List[AudioSegment]:
+        """
+        Generate audio for one length bin (batched, or per turn in parallel).
+
+        Args:
+            bin_name: TURN_LENGTH_BINS bin the turns belong to
+            turns: List of dialogue turns
+            on_ready: Called with (turn index, audio) as each turn completes
+
+        Returns:
+            One AudioSegment per turn, in order
+        """
+        semaphore = self._bin_semaphores[bin_name]
+        # Per-turn records are skipped outright (no kwargs built) unless DEBUG is on
+        debug_enabled = logging.getLogger(__name__).isEnabledFor(logging.DEBUG)
+
+        # Generate a single turn asynchronously
+        async def generate_turn(i: int, turn: Dict) -> AudioSegment:
             speaker = turn.get("speaker", "Brainy")
             text = turn.get("text", "")
 
-            logger.debug(
-                "generating_turn_parallel",
-                turn_index=i,
-                speaker=speaker,
-                text_length=len(text)
-            )
+            async with semaphore:
+                audio_segment = await self.parler_client.generate_audio(
+                    text=text,
+                    speaker=speaker
+                )
+
+            if debug_enabled:
+                logger.debug(
+                    "turn_generated_parallel",
+                    turn_index=i,
+                    length_bin=bin_name,
+                    speaker=speaker,
+                    text_length=len(text),
+                    duration_ms=len(audio_segment)
+                )
+
+            if on_ready is not None:
+                on_ready(i, audio_segment)
+            return audio_segment
+
+        # Prefer one batched request per 32 turns (server pays model setup once).
+        # Any batch failure (5xx, bad ZIP, ...) falls back to per-turn requests
+        segments = None
+        if self.parler_batch_supported:
+            try:
+                async with semaphore:
+                    segments = await self.parler_client.generate_audio_batch([
+                        {"text": turn.get("text", ""), "speaker": turn.get("speaker", "Brainy")}
+                        for turn in turns
+                    ])
+            except ParlerBatchUnsupported as e:
+                self.parler_batch_supported = False
+                logger.warning("parler_batch_unsupported_using_per_turn", error=str(e))
+            except Exception as e:
+                logger.warning("parler_batch_failed_using_per_turn", error=str(e))
+
+        if segments is not None:
+            if on_ready is not None:
+                for i, audio_segment in enumerate(segments):
+                    on_ready(i, audio_segment)
+            return segments
+
+        # Generate all turns concurrently (gather preserves turn order)
+        return list(await asyncio.gather(
+            *[generate_turn(i, turn) for i, turn in enumerate(turns)]
+        ))
+
+
+class EpisodeAudioStream:
+    """
+    One episode's MP3, encoded while its sections are still being synthesized.
 
-            # Run synchronous generate_audio in thread pool
-            audio_segment = await asyncio.to_thread(
-                self.parler_client.generate_audio,
-                text=text,
-                speaker=speaker
-            )
+    Sections can be added in any order (e.g. as concurrent LLM calls finish).
+    A turn is encoded as soon as it and every turn before it in script order
+    are ready, so encoding starts while later sections are still being
+    written and synthesized.
+
+    Created by UnifiedTTSService.start_episode_audio.
+    """
+
+    def __init__(
+        self,
+        service: UnifiedTTSService,
+        output_path: str,
+        silence_between_turns: int,
+        use_emotions: bool,
+    ):
+        self.service = service
+        self.output_path = output_path
+        self.silence_between_turns = silence_between_turns
+        self.use_emotions = use_emotions
+        # Turns of every section placed so far, in script order
+        self.script: List[Dict] = []
+
+        self._sections: Dict[int, List[Dict]] = {}
+        # Script offset of each placed section (all sections before it added)
+        self._offsets: Dict[int, int] = {}
+        # Turns that finished before their section could be placed
+        self._held: Dict[int, List[Tuple[int, AudioSegment]]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._done = False
+        # Turn audio by cache key across sections (see synthesize_turns)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self._encoder = Mp3StreamEncoder(output_path)
+        # (script index, audio) in completion order; None once all are queued
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._encode_in_order())
+
+    def add_section(self, index: int, turns: List[Dict]):
+        """
+        Start synthesizing one section's turns.
+
+        Args:
+            index: Section position in the episode (0-based)
+            turns: The section's dialogue turns
+        """
+        if index in self._sections:
+            raise ValueError(f"Section {index} was already added")
+        self._sections[index] = turns
+
+        # Place every section whose predecessors are now all known
+        while len(self._offsets) in self._sections:
+            section = len(self._offsets)
+            self._offsets[section] = len(self.script)
+            self.script.extend(self._sections[section])
+            for i, audio_segment in self._held.pop(section, []):
+                self._ready.put_nowait((self._offsets[section] + i, audio_segment))
+
+        self._tasks.append(asyncio.create_task(self.service.synthesize_turns(
+            turns,
+            on_ready=lambda i, audio_segment: self._turn_ready(index, i, audio_segment),
+            in_flight=self._in_flight
+        )))
+
+    def _turn_ready(self, section: int, i: int, audio_segment: AudioSegment):
+        """Queue a finished turn for the writer, or hold it until its section is placed."""
+        if section in self._offsets:
+            self._ready.put_nowait((self._offsets[section] + i, audio_segment))
+        else:
+            self._held.setdefault(section, []).append((i, audio_segment))
+
+    async def finish(self) -> Dict:
+        """
+        Wait for every added section and complete the MP3 file.
+
+        Returns:
+            Dict with metadata including turn_timings for synchronization
 
-            logger.debug(
-                "turn_generated_parallel",
-                turn_index=i,
-                duration_ms=len(audio_segment)
+        Raises:
+            Exception: If a section is missing or generation fails
+        """
+        try:
+            try:
+                if len(self._offsets) != len(self._sections):
+                    raise Exception(f"section {len(self._offsets)} was never added")
+
+                await asyncio.gather(*self._tasks)
+                self._ready.put_nowait(None)
+                turn_timings = await self._writer
+                file_size_bytes = await self._encoder.close()
+                self._done = True
+            except BaseException:
+                self.abort()
+                raise
+        except Exception as e:
+            logger.error(
+                "parler_generation_failed",
+                error=str(e),
+                turns_attempted=len(self.script)
             )
+            raise Exception(f"Parler TTS generation failed: {str(e)}")
+
+        # Calculate metadata
+        duration_seconds = self._encoder.position_ms / 1000.0
+        file_size_mb = file_size_bytes / (1024 * 1024)
+
+        metadata = {
+            'duration_seconds': duration_seconds,
+            'duration_minutes': duration_seconds / 60,
+            'file_size_mb': round(file_size_mb, 2),
+            'total_turns': len(self.script),
+            'output_path': self.output_path,
+            'tts_provider_used': 'parler',
+            'tts_providers_available': {
+                'parler': self.service.parler_available,
+            },
+            'emotions_enabled': self.use_emotions,
+            'voice_consistency': 'guaranteed',
+            'turn_timings': turn_timings,
+        }
+
+        logger.info(
+            "episode_audio_generated_successfully",
+            provider="parler",
+            duration_seconds=duration_seconds,
+            turn_count=len(self.script),
+            file_size_mb=metadata['file_size_mb']
+        )
 
-            return i, audio_segment, turn
+        return metadata
 
-        # Process all turns with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent)
+    def abort(self):
+        """Stop synthesis and encoding and remove the partial file (safe to repeat)."""
+        if self._done:
+            return
+        self._done = True
 
-        async def generate_with_limit(i, turn):
-            async with semaphore:
-                return await generate_turn(i, turn)
+        for task in self._tasks:
+            task.cancel()
+        self._writer.cancel()
+        self._encoder.abort()
 
-        # Generate all turns concurrently
-        tasks = [generate_with_limit(i, turn) for i, turn in enumerate(script)]
-        results = await asyncio.gather(*tasks)
+    async def _encode_in_order(self) -> List[Dict]:
+        """
+        Feed turns to the encoder in script order as they become ready.
 
-        # Sort by turn index to ensure correct order
-        results.sort(key=lambda x: x[0])
+        Turn timings are read from the encoder's stream position, so they
+        match the encoded audio exactly (after any resampling) without
+        another pass over the turns.
 
-        # Stitch audio in order and calculate timings
-        full_audio = AudioSegment.empty()
+        Returns:
+            One timing dict per turn, for synchronization
+        """
+        encoder = self._encoder
+        script = self.script
+        # Turns that finished before an earlier turn, held until it arrives
+        waiting: Dict[int, AudioSegment] = {}
         turn_timings = []
-        cumulative_ms = 0
 
-        for i, audio_segment, turn in results:
-            speaker = turn.get("speaker", "Brainy")
-            turn_duration_ms = len(audio_segment)
-
-            turn_timings.append({
-                "turn_index": i,
-                "start_ms": cumulative_ms,
-                "end_ms": cumulative_ms + turn_duration_ms,
-                "duration_ms": turn_duration_ms,
-                "speaker": speaker,
-                "section_id": turn.get('section_id', '')
-            })
-
-            # Add to full audio
-            full_audio += audio_segment
-            cumulative_ms += turn_duration_ms
-
-            # Add silence between turns (except after last turn)
-            if i < len(script) - 1:
-                full_audio += silence
-                cumulative_ms += silence_between_turns
+        while True:
+            item = await self._ready.get()
+            if item is None:
+                break
+            i, audio_segment = item
+            waiting[i] = audio_segment
+
+            while len(turn_timings) in waiting:
+                index = len(turn_timings)
+
+                # Silence between turns (not before the first one)
+                if index > 0:
+                    await encoder.write_silence(self.silence_between_turns)
+
+                start_ms = encoder.position_ms
+                await encoder.write(waiting.pop(index))
+                end_ms = encoder.position_ms
+
+                turn_timings.append({
+                    "turn_index": index,
+                    "start_ms": start_ms,
+                    "end_ms": end_ms,
+                    "duration_ms": end_ms - start_ms,
+                    "speaker": script[index].get("speaker", "Brainy"),
+                    "section_id": script[index].get('section_id', '')
+                })
+
+        if len(turn_timings) != len(script):
+            raise Exception(f"expected {len(script)} turns but encoded {len(turn_timings)}")
 
         logger.info(
             "parler_generation_complete_parallel",
-            total_duration_ms=cumulative_ms,
+            total_duration_ms=encoder.position_ms,
             total_turns=len(script)
         )
 
-        return full_audio, turn_timings
+        return turn_timings
+
+
+# Global service instance (created on first use, not at import)
+_unified_tts_service: Optional[UnifiedTTSService] = None
+_unified_tts_service_lock = threading.Lock()
 
 
-# Global service instance
-unified_tts_service = UnifiedTTSService()
+async def get_unified_tts_service() -> UnifiedTTSService:
+    """Get or initialize the global TTS service (Parler is probed on first use)."""
+    global _unified_tts_service
+    with _unified_tts_service_lock:
+        if _unified_tts_service is None:
+            _unified_tts_service = UnifiedTTSService()
+    return _unified_tts_service
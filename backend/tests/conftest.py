@@ -0,0 +1,12 @@
+"""
+Shared test setup.
+
+Settings requires API keys at import time; tests never call the LLM APIs,
+so placeholders are enough. The TTS cache uses WAV so tests don't need ffmpeg.
+"""
+
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ["TTS_CACHE_CODEC"] = "wav"
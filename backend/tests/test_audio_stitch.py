@@ -0,0 +1,37 @@
+"""Tests for join_segments and _silence_bytes."""
+
+from pydub import AudioSegment
+
+from app.services.audio_stitch import _silence_bytes, join_segments
+
+
+def test_silence_bytes_length():
+    # 16-bit stereo at 16 kHz: 250 ms = 4000 frames of 4 bytes
+    silence = _silence_bytes(250, 16000, 2, 2)
+
+    assert silence == b"\x00" * 16000
+
+
+def test_silence_bytes_is_cached():
+    assert _silence_bytes(100, 24000, 1, 2) is _silence_bytes(100, 24000, 1, 2)
+
+
+def test_join_matches_pydub_concatenation():
+    a = AudioSegment.silent(duration=300, frame_rate=16000)
+    b = AudioSegment.silent(duration=200, frame_rate=24000).set_channels(2)
+    gap = AudioSegment.silent(duration=100, frame_rate=16000)
+
+    joined = join_segments([a, b], silence_ms=100)
+    expected = a + gap + b
+
+    assert (joined.frame_rate, joined.channels, joined.sample_width) == (
+        expected.frame_rate, expected.channels, expected.sample_width
+    )
+    assert len(joined.raw_data) == len(expected.raw_data)
+
+
+def test_join_empty_and_single():
+    segment = AudioSegment.silent(duration=100, frame_rate=16000)
+
+    assert len(join_segments([])) == 0
+    assert join_segments([segment], silence_ms=500).raw_data == segment.raw_data
@@ -0,0 +1,49 @@
+"""Tests for QuizGenerator._generate_questions."""
+
+import pytest
+
+from app.services.quiz_generator import QuizGenerator
+
+CONCEPTS = [
+    {"id": "c1", "name": "Photosynthesis"},
+    {"id": "c2", "name": "Respiration"},
+    {"id": "c3", "name": "Osmosis"},
+]
+
+
+def _generator(fail_for=()):
+    generator = QuizGenerator(llm_service=None)
+
+    async def generate_question(concept, document_excerpt, variant=0):
+        if (concept["id"], variant) in fail_for:
+            raise ValueError("malformed LLM response")
+        return {"question": f"{concept['name']} #{variant}"}
+
+    generator._generate_question = generate_question
+    return generator
+
+
+@pytest.mark.asyncio
+async def test_question_ids_are_renumbered_after_failures():
+    generator = _generator(fail_for={("c1", 0), ("c3", 0)})
+
+    questions = await generator._generate_questions(CONCEPTS, "document", target_count=5)
+
+    assert [q["question_id"] for q in questions] == ["q1", "q2", "q3"]
+    assert [q["question"] for q in questions] == [
+        "Respiration #0", "Photosynthesis #1", "Respiration #1"
+    ]
+    assert [q["concept_id"] for q in questions] == ["c2", "c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_all_failures_raise():
+    generator = _generator(fail_for={("c1", 0)})
+
+    with pytest.raises(ValueError):
+        await generator._generate_questions(CONCEPTS[:1], "document", target_count=1)
+
+
+@pytest.mark.asyncio
+async def test_no_concepts_returns_empty():
+    assert await _generator()._generate_questions([], "document", target_count=3) == []
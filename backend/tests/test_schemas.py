@@ -0,0 +1,39 @@
+"""Tests for gemini_response_schema."""
+
+from app.models.schemas import (
+    GEMINI_SCHEMA_KEYS,
+    LLMDialogueSection,
+    LLMQuizQuestion,
+    gemini_response_schema,
+)
+
+
+def _walk(schema):
+    yield schema
+    for prop in schema.get("properties", {}).values():
+        yield from _walk(prop)
+    if "items" in schema:
+        yield from _walk(schema["items"])
+
+
+def test_only_supported_keys_remain():
+    for schema in _walk(gemini_response_schema(LLMQuizQuestion)):
+        assert set(schema) <= GEMINI_SCHEMA_KEYS
+
+
+def test_refs_are_inlined():
+    schema = gemini_response_schema(LLMDialogueSection)
+    turn = schema["properties"]["script"]["items"]
+
+    assert turn["type"] == "object"
+    assert "speaker" in turn["properties"]
+
+
+def test_optional_fields_are_nullable():
+    turn = gemini_response_schema(LLMDialogueSection)["properties"]["script"]["items"]
+
+    assert turn["properties"]["section_id"] == {"type": "string", "nullable": True}
+
+
+def test_schema_is_built_once_per_model():
+    assert gemini_response_schema(LLMQuizQuestion) is gemini_response_schema(LLMQuizQuestion)
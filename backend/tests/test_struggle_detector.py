@@ -0,0 +1,62 @@
+"""Tests for StruggleDetector's level and recommendation tables."""
+
+import pytest
+
+from app.services.struggle_detector import StruggleDetector, StruggleLevel
+
+QUESTION = {"question_id": "q1", "options": [{"id": o} for o in "ABCD"]}
+
+
+def _attempts(*selected, correct=None):
+    return [
+        {"selected_option": option, "is_correct": option == correct}
+        for option in selected
+    ]
+
+
+@pytest.mark.parametrize("selected, level, trigger", [
+    ((), StruggleLevel.NONE, False),
+    (("A",), StruggleLevel.MINOR, False),
+    (("A", "B"), StruggleLevel.MODERATE, False),
+    (("A", "B", "C"), StruggleLevel.SIGNIFICANT, True),
+    (("A", "B", "C", "D"), StruggleLevel.SIGNIFICANT, True),
+])
+def test_level_by_wrong_count(selected, level, trigger):
+    result = StruggleDetector().analyze_attempts(_attempts(*selected), QUESTION)
+
+    assert result["struggle_level"] == level
+    assert result["should_trigger_learning_mode"] is trigger
+    assert result["wrong_attempt_count"] == len(selected)
+
+
+def test_correct_attempts_are_not_counted():
+    result = StruggleDetector().analyze_attempts(_attempts("A", "B", correct="B"), QUESTION)
+
+    assert result["wrong_attempt_count"] == 1
+    assert result["struggle_level"] == StruggleLevel.MINOR
+    assert result["total_attempt_count"] == 2
+
+
+@pytest.mark.parametrize("selected, recommendation", [
+    ((), "No intervention needed - user is progressing well"),
+    (("A",), "Provide Level 1 hint (gentle nudge)"),
+    (("A", "B"), "Provide Level 2 hint to guide thinking"),
+    (("A", "A"), "Provide Level 2 hint addressing specific misconception"),
+    (("A", "B", "C"), "Trigger Interactive Learning Mode to build understanding through Socratic questioning"),
+])
+def test_recommendation(selected, recommendation):
+    result = StruggleDetector().analyze_attempts(_attempts(*selected), QUESTION)
+
+    assert result["recommendation"] == recommendation
+
+
+@pytest.mark.parametrize("selected, pattern", [
+    (("A",), "insufficient_data"),
+    (("A", "A", "A"), "consistent_misconception"),
+    (("A", "B", "C"), "random_guessing"),
+    (("A", "B", "A"), "mixed"),
+])
+def test_answer_pattern(selected, pattern):
+    result = StruggleDetector().analyze_attempts(_attempts(*selected), QUESTION)
+
+    assert result["pattern_analysis"]["pattern_type"] == pattern
@@ -0,0 +1,90 @@
+"""Tests for the TTS cache's on-disk LRU eviction."""
+
+import os
+
+from pydub import AudioSegment
+
+from app.services.audio_decoder import encode_cache_entry
+from app.services.tts_cache import TTSCache
+
+
+def _turn(duration_ms: int = 200) -> AudioSegment:
+    return AudioSegment.silent(duration=duration_ms, frame_rate=16000)
+
+
+def _entry_size() -> int:
+    return len(encode_cache_entry(_turn())[0])
+
+
+def _set_mtime(cache: TTSCache, key: str, mtime: float):
+    os.utime(cache._path(key, "wav"), (mtime, mtime))
+
+
+def test_put_evicts_least_recently_used_file(tmp_path):
+    cache = TTSCache(tmp_path, max_disk_bytes=int(_entry_size() * 2.5))
+
+    cache.put_blocking("a" * 64, _turn())
+    cache.put_blocking("b" * 64, _turn())
+    _set_mtime(cache, "a" * 64, 1000)
+    _set_mtime(cache, "b" * 64, 2000)
+
+    cache.put_blocking("c" * 64, _turn())
+
+    assert not cache._path("a" * 64, "wav").exists()
+    assert cache._path("b" * 64, "wav").exists()
+    assert cache._path("c" * 64, "wav").exists()
+    assert cache.stats["evictions"] == 1
+
+
+def test_disk_hit_protects_entry_from_eviction(tmp_path):
+    # No memory tier, so every lookup reads (and touches) the file
+    cache = TTSCache(tmp_path, max_memory_entries=0, max_disk_bytes=int(_entry_size() * 2.5))
+
+    cache.put_blocking("a" * 64, _turn())
+    cache.put_blocking("b" * 64, _turn())
+    _set_mtime(cache, "a" * 64, 1000)
+    _set_mtime(cache, "b" * 64, 2000)
+
+    assert cache.get_blocking("a" * 64) is not None
+    cache.put_blocking("c" * 64, _turn())
+
+    assert cache._path("a" * 64, "wav").exists()
+    assert not cache._path("b" * 64, "wav").exists()
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_eviction_goes_below_cap(tmp_path):
+    entry_size = _entry_size()
+    cache = TTSCache(tmp_path, max_disk_bytes=entry_size * 4)
+
+    for i in range(5):
+        key = f"{i:064d}"
+        cache.put_blocking(key, _turn())
+        _set_mtime(cache, key, 1000 + i)
+
+    remaining = sorted(path.name for path in tmp_path.glob("*/*.wav"))
+    assert remaining == [f"{i:064d}.wav" for i in (2, 3, 4)]
+    assert cache._disk_bytes == entry_size * 3
+
+
+def test_overwrite_does_not_grow_disk_usage(tmp_path):
+    cache = TTSCache(tmp_path)
+
+    cache.put_blocking("a" * 64, _turn())
+    cache.put_blocking("b" * 64, _turn())
+    cache.put_blocking("a" * 64, _turn())
+
+    assert cache._disk_bytes == _entry_size() * 2
+
+
+def test_get_round_trips_audio(tmp_path):
+    cache = TTSCache(tmp_path)
+    key = TTSCache.make_key("parler", "Brainy", "Hello there")
+
+    assert cache.get_blocking(key) is None
+    cache.put_blocking(key, _turn(500))
+
+    audio = cache.get_blocking(key)
+    assert audio is not None
+    assert abs(len(audio) - 500) <= 1
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 0, "misses": 1, "evictions": 0}